@@ -1,3 +1,4 @@
+import heapq
 from typing import Tuple, Union
 import cv2
 import numpy as np
@@ -5,6 +6,12 @@ np.random.seed(0)
 
 ACTION_SPACE_SIZE = 4
 DIRECTIONS = {"up": 0, "right": 1, "down": 2, "left": 3}
+RENDER_MODES = ("human", "rgb_array")
+# values of the entity grid, and their values in the game state
+EMPTY, COIN, GHOST = range(3)
+ENTITY_STATE_VALUES = np.array([0.0, 0.25, 0.5])
+# 'none' gives no reward yet, 'shaped' rewards the collected coins and the steps towards the nearest coin
+REWARD_MODES = ("none", "shaped")
 
 
 class Pacman:
@@ -23,6 +30,8 @@ class Pacman:
             contains the (x, y) coordinate pairs of the generated coin objects
         ghosts_pos : list (of tuples)
             contains the (x, y) coordinate pairs of the generated ghost objects
+        entity_grid : ndarray
+            map_size x map_size array of the coins and ghosts (EMPTY/COIN/GHOST), for O(1) lookups by position
         pos : tuple
             defines the position of PacMan
         step_counter : int
@@ -32,11 +41,11 @@ class Pacman:
         orientation : int
             defines PacMan's facing direction
         state : ndarray
-            defines an array representing the game status
+            defines an array representing the game status, updated in place cell by cell during the steps
         image_size : int = 600
             passed as an argument to the constructor, defines the size of the displayed visualization window
         image : ndarray
-            BGR channel image array, which is displayed in the render function
+            BGR channel uint8 image array, which is displayed in the render function
         ratio : int
             image_size divided by the MAP_SIZE, used for the visualization window in image preprocessing
         num_coins : int = 100
@@ -47,15 +56,21 @@ class Pacman:
             value of each collected coin
         max_step : int = 100
             termination limit value
+        reward_mode : str = 'none'
+            'none' or 'shaped', see _get_reward
+        coin_distance : ndarray
+            map_size x map_size array of the distances to the nearest coin (map_size ** 2 if there is no coin left),
+            only maintained in 'shaped' reward mode
 
 
     Methods:
         __init__(self, image_size: int = 600, map_size: int = 30, max_step: int = 100, num_ghosts: int = 4,
-                 num_coins: int = 100, score_coin: int = 10) -> None
-        reset(self) -> numpy.ndarray
-        step(self, action: int) -> Tuple[numpy.ndarray, float, bool, str]
-        render(self) -> None
+                 num_coins: int = 100, score_coin: int = 10, reward_mode: str = "none") -> None
+        reset(self, copy: bool = True) -> numpy.ndarray
+        step(self, action: int, copy: bool = True) -> Tuple[numpy.ndarray, float, bool, str]
+        render(self, mode: str = "human") -> numpy.ndarray | None
         _create_image(self) -> None
+        _upscale(self, state: numpy.ndarray) -> numpy.ndarray
         _move(self) -> None
         _get_info(self) -> str
         _get_reward(self, state: numpy.ndarray) -> float
@@ -66,13 +81,21 @@ class Pacman:
         _check_done(self) -> bool
         _generate_pos(self, object_name: str, num_objects: int) -> None
         _update_map(self) -> numpy.ndarray
+        _update_cells(self, prev_pos: list) -> None
+        _remove_coin(self, pos: list) -> None
+        _occupy(self, cell: int) -> None
+        _release(self, cell: int) -> None
+        _build_coin_distance(self) -> None
+        _update_coin_distance(self, pos: list) -> None
     """
     def __init__(self, image_size: int = 600, map_size: int = 30, max_step: int = 100, num_ghosts: int = 4,
-                 num_coins: int = 100, score_coin: int = 10) -> None:
+                 num_coins: int = 100, score_coin: int = 10, reward_mode: str = "none") -> None:
         """
         Constructs the basic components of the Pacman Environment Class.
         :return: None
         """
+        if reward_mode not in REWARD_MODES:
+            raise ValueError("Please choose a reward mode from {0}!".format(REWARD_MODES))
         self.map_size = map_size
         self.action_space = np.arange(ACTION_SPACE_SIZE)
         self.state = None
@@ -83,6 +106,22 @@ class Pacman:
         self.ghosts_pos = []
         self.score_coin = score_coin
         self.pos = None
+        self.entity_grid = np.zeros((self.map_size, self.map_size), dtype=np.int8)
+        # index of each coin in coins_pos, so an eaten coin can be removed without a search
+        self._coin_index = {}
+        # free cells (as row * map_size + col) in the first _num_free items, and the index of each cell in it,
+        # so that a random free cell can be taken in O(1) without rejection sampling
+        self._free = np.arange(self.map_size * self.map_size)
+        self._free_pos = np.arange(self.map_size * self.map_size)
+        self._num_free = self.map_size * self.map_size
+
+        self.reward_mode = reward_mode
+        self.coin_distance = None
+        # the coin (as row * map_size + col) each cell is the nearest to, -1 if there is no coin left
+        self._coin_label = None
+        # the neighbouring cells of each cell, the map wraps around at the edges
+        self._neighbors = None
+        self._prev_pos = None
 
         self.max_step = max_step
         self.step_counter = None
@@ -90,14 +129,21 @@ class Pacman:
         self.orientation = None
 
         self.image_size = image_size
-        self.image = np.zeros((self.image_size, self.image_size, 3))
+        self.image = np.zeros((self.image_size, self.image_size, 3), dtype=np.uint8)
         self.ratio = int(self.image_size / self.map_size)
+        # map cell of each pixel row/column, the last cell also covers the remainder of the image
+        self._pixel_cells = np.minimum(np.arange(self.image_size) // self.ratio, self.map_size - 1)
+        # first pixel row/column of each map cell, and the end of the image
+        self._cell_bounds = np.append(np.arange(self.map_size) * self.ratio, self.image_size)
+        # the state which is drawn on the image, only the cells differing from it are repainted
+        self._drawn_state = None
 
         self.reset()
 
-    def reset(self) -> np.ndarray:
+    def reset(self, copy: bool = True) -> np.ndarray:
         """
         This function resets the game session and returns a newly generated game state.
+        :param copy: if False, the state array of the environment itself is returned, which changes in the next steps
         :return: current state of the game (empty map with PacMan, ghosts and coins generated)
         """
         self.step_counter = 0
@@ -106,24 +152,32 @@ class Pacman:
 
         self.ghosts_pos = []
         self.coins_pos = []
+        self.entity_grid.fill(EMPTY)
+        self._coin_index = {}
+        self._num_free = self.map_size * self.map_size
 
         self._generate_pos('self_pos', 1)
         self._generate_pos('ghost', self.num_ghosts)
         self._generate_pos('coin', self.num_coins)
 
         self.state = self._update_map()
+        self._prev_pos = list(self.pos)
+        if self.reward_mode == "shaped":
+            self._build_coin_distance()
 
-        return self.state
+        return self.state.copy() if copy else self.state
 
-    def step(self, action: int) -> Tuple[np.ndarray, float, bool, str]:
+    def step(self, action: int, copy: bool = True) -> Tuple[np.ndarray, float, bool, str]:
         """
         This function formulates the (next_state, reward, done, info) values, thus moving the game one step forward.
         :param action: chosen action 0/1/2/3 corresponding to the directions in order up/right/down/left)
+        :param copy: if False, the state array of the environment itself is returned without copying, which changes
+            in the next steps
         :return:
             next_state : ndarray
                 state of the environment after the action
             reward : float
-                quantification of the state transition ###(To be implemented...)###
+                quantification of the state transition, 0.0 unless the reward mode is 'shaped'
             done : bool
                 True if the game is terminated, otherwise False
             info : str
@@ -134,25 +188,56 @@ class Pacman:
         done = self._check_done()
         info = self._get_info()
 
-        return next_state, reward, done, info
+        return next_state.copy() if copy else next_state, reward, done, info
 
-    def render(self) -> None:
+    def render(self, mode: str = "human") -> Union[np.ndarray, None]:
         """
         This function creates a visualization of the game state.
-        :return: None
+        :param mode: 'human' displays the image in a window, 'rgb_array' returns the image without displaying and
+            blocking
+        :return: RGB image array in 'rgb_array' mode, otherwise None
         """
+        if mode not in RENDER_MODES:
+            raise ValueError("Please choose a render mode from {0}!".format(RENDER_MODES))
         self._create_image()
+        if mode == "rgb_array":
+            return cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
         cv2.imshow("AgiliTEAM Pacman Environment", self.image)
         cv2.waitKey(50)
+        return None
 
     def _create_image(self) -> None:
         """
         This function processes the environment's state and creates the image array according to the given display size.
+        The map has no walls yet, so the static background is the empty map: the image of the previous call is kept,
+        and only the cells changed since then are repainted.
         :return: None
         """
-        for i in range(self.image_size):
-            for j in range(self.image_size):
-                self.image[i][j] = self.state[i // self.ratio][j // self.ratio]
+        if self._drawn_state is None:
+            self.image[...] = self._upscale(self.state)[:, :, np.newaxis]
+            self._drawn_state = self.state.copy()
+            return
+
+        changed_rows, changed_cols = np.nonzero(self.state != self._drawn_state)
+        if len(changed_rows) > self.map_size:
+            # repainting many cells one by one is slower than upscaling the whole map
+            self.image[...] = self._upscale(self.state)[:, :, np.newaxis]
+        else:
+            bounds = self._cell_bounds
+            for row, col in zip(changed_rows, changed_cols):
+                self.image[bounds[row]:bounds[row + 1], bounds[col]:bounds[col + 1]] = \
+                    round(self.state[row, col] * 255)
+        np.copyto(self._drawn_state, self.state)
+
+    def _upscale(self, state: np.ndarray) -> np.ndarray:
+        """
+        This function scales the state up to the image size with nearest-neighbour interpolation.
+        :param state: ndarray of the game state
+        :return: uint8 grayscale image of the state
+        """
+        gray = np.rint(state * 255).astype(np.uint8)
+
+        return gray.take(self._pixel_cells, axis=0).take(self._pixel_cells, axis=1)
 
     def _get_info(self) -> str:
         """
@@ -171,8 +256,14 @@ class Pacman:
         :return: reward value from which the agent is able to learn
         """
         # Only for RL purposes
-        # TODO: add implementation of reward function
+        # 'shaped' mode: the coin collected in the step, plus the decrease of the distance to the nearest coin
+        # (the coin is not removed yet, so it is at 0 distance when PacMan steps on it)
         reward = 0.0
+        if self.reward_mode == "shaped":
+            if self.entity_grid[self.pos[0], self.pos[1]] == COIN:
+                reward += self.score_coin
+            reward += float(self.coin_distance[self._prev_pos[0], self._prev_pos[1]] -
+                            self.coin_distance[self.pos[0], self.pos[1]])
 
         return reward
 
@@ -185,8 +276,10 @@ class Pacman:
         valid = self._check_action_validity(action)
         if valid:
             self._set_action(action)
+        prev_pos = list(self.pos)
         self._move()
-        self.state = self._update_map()
+        self._update_cells(prev_pos)
+        self._prev_pos = prev_pos
 
         return self.state
 
@@ -195,6 +288,9 @@ class Pacman:
         This function modifies PacMan's position according to its facing direction.
         :return: None
         """
+        if self.entity_grid[self.pos[0], self.pos[1]] == EMPTY:
+            self._release(self.pos[0] * self.map_size + self.pos[1])
+
         # if facing of the game_state_test == _direction_:
         #     if game_state_test is at the end of the map:
         #         move to the opposite side
@@ -209,6 +305,7 @@ class Pacman:
         elif self.orientation == DIRECTIONS["left"]:
             self.pos[1] = self.map_size - 1 if self.pos[1] - 1 < 0 else self.pos[1] - 1
 
+        self._occupy(self.pos[0] * self.map_size + self.pos[1])
         self.step_counter += 1
 
     def _set_action(self, action: Union[int, None]) -> None:
@@ -240,10 +337,9 @@ class Pacman:
             +10 / coin collected
         :return: None
         """
-        for coin_pos in self.coins_pos:
-            if self.pos == coin_pos:
-                self.score += self.score_coin
-                self.coins_pos.remove(coin_pos)
+        if self.entity_grid[self.pos[0], self.pos[1]] == COIN:
+            self.score += self.score_coin
+            self._remove_coin(self.pos)
 
     def _check_done(self) -> bool:
         """
@@ -254,10 +350,9 @@ class Pacman:
             print("Time step limit reached!")
             return True
 
-        for ghost_pos in self.ghosts_pos:
-            if self.pos == ghost_pos:
-                print("You have been caught by a ghost!")
-                return True
+        if self.entity_grid[self.pos[0], self.pos[1]] == GHOST:
+            print("You have been caught by a ghost!")
+            return True
 
         return False
 
@@ -268,33 +363,160 @@ class Pacman:
         :param num_objects: number of objects for coordinates
         :return: None
         """
+        if object_name not in ('ghost', 'coin', 'self_pos'):
+            raise NotImplementedError("Not implemented for the given object name!")
+        if num_objects > self._num_free:
+            raise ValueError("There are only {0} free spots on the map!".format(self._num_free))
+
         for _ in range(num_objects):
-            pos = list(np.random.randint(self.map_size, size=(2,)))
-            while pos in self.coins_pos or pos == self.pos or pos in self.ghosts_pos:
-                pos = list(np.random.randint(self.map_size, size=(2,)))
+            cell = self._free[np.random.randint(self._num_free)]
+            self._occupy(cell)
+            pos = [int(cell) // self.map_size, int(cell) % self.map_size]
 
             if object_name == 'ghost':
                 self.ghosts_pos.append(pos)
+                self.entity_grid[pos[0], pos[1]] = GHOST
             elif object_name == 'coin':
+                self._coin_index[tuple(pos)] = len(self.coins_pos)
                 self.coins_pos.append(pos)
-            elif object_name == 'self_pos':
-                self.pos = pos
+                self.entity_grid[pos[0], pos[1]] = COIN
             else:
-                raise NotImplementedError("Not implemented for the given object name!")
+                self.pos = pos
 
     def _update_map(self) -> np.ndarray:
         """
-        This function updates the game state according to the modified coordinates in position tuples.
+        This function builds the whole game state from the entity grid and PacMan's position.
         :return: game state after modification
         """
-        state = np.zeros((self.map_size, self.map_size))
-
-        for coin_pos in self.coins_pos:
-            state[coin_pos[0], coin_pos[1]] = 0.25
-
-        for ghost_pos in self.ghosts_pos:
-            state[ghost_pos[0], ghost_pos[1]] = 0.5
-
+        state = ENTITY_STATE_VALUES[self.entity_grid]
         state[self.pos[0], self.pos[1]] = 1
 
         return state
+
+    def _update_cells(self, prev_pos: list) -> None:
+        """
+        This function updates the game state in place after a move, repainting only the cell left by PacMan and the
+        one entered. An eaten coin disappears when PacMan leaves its cell, as PacMan covers it until then. The ghosts
+        do not move yet, so their cells never change.
+        :param prev_pos: PacMan's position before the move
+        :return: None
+        """
+        self.state[prev_pos[0], prev_pos[1]] = ENTITY_STATE_VALUES[self.entity_grid[prev_pos[0], prev_pos[1]]]
+        self.state[self.pos[0], self.pos[1]] = 1
+
+    def _remove_coin(self, pos: list) -> None:
+        """
+        This function removes a coin from the map in O(1), moving the last coin of coins_pos in its place.
+        :param pos: (x, y) coordinate pair of the coin
+        :return: None
+        """
+        index = self._coin_index.pop(tuple(pos))
+        last = self.coins_pos.pop()
+        if index < len(self.coins_pos):
+            self.coins_pos[index] = last
+            self._coin_index[tuple(last)] = index
+        self.entity_grid[pos[0], pos[1]] = EMPTY
+        if self.reward_mode == "shaped":
+            self._update_coin_distance(pos)
+        if pos != self.pos:
+            self._release(pos[0] * self.map_size + pos[1])
+
+    def _occupy(self, cell: int) -> None:
+        """
+        This function removes a cell from the free cells, by swapping it with the last free one.
+        :param cell: row * map_size + col index of the cell
+        :return: None
+        """
+        index = self._free_pos[cell]
+        if index >= self._num_free:
+            return
+        last = self._free[self._num_free - 1]
+        self._free[index], self._free[self._num_free - 1] = last, cell
+        self._free_pos[last], self._free_pos[cell] = index, self._num_free - 1
+        self._num_free -= 1
+
+    def _release(self, cell: int) -> None:
+        """
+        This function adds a cell to the free cells, by swapping it with the first occupied one.
+        :param cell: row * map_size + col index of the cell
+        :return: None
+        """
+        index = self._free_pos[cell]
+        if index < self._num_free:
+            return
+        first = self._free[self._num_free]
+        self._free[index], self._free[self._num_free] = first, cell
+        self._free_pos[first], self._free_pos[cell] = index, self._num_free
+        self._num_free += 1
+
+    def _build_coin_distance(self) -> None:
+        """
+        This function computes the distance of every cell to the nearest coin with a multi-source BFS from all the
+        coins, expanding the whole frontier with array operations in each round.
+        :return: None
+        """
+        size = self.map_size
+        if self._neighbors is None:
+            cells = np.arange(size * size)
+            rows, cols = np.divmod(cells, size)
+            self._neighbors = np.stack([((rows - 1) % size) * size + cols, rows * size + (cols + 1) % size,
+                                        ((rows + 1) % size) * size + cols, rows * size + (cols - 1) % size],
+                                       axis=1).tolist()
+
+        distance = np.full((size, size), size * size, dtype=np.int64)
+        label = np.full((size, size), -1, dtype=np.int64)
+        frontier = self.entity_grid == COIN
+        distance[frontier] = 0
+        label[frontier] = np.flatnonzero(frontier)
+        step = 0
+        while frontier.any():
+            step += 1
+            reached = np.zeros_like(frontier)
+            for axis, shift in ((0, 1), (0, -1), (1, 1), (1, -1)):
+                new_cells = np.roll(frontier, shift, axis) & (label == -1) & ~reached
+                label[new_cells] = np.roll(label, shift, axis)[new_cells]
+                reached |= new_cells
+            distance[reached] = step
+            frontier = reached
+
+        self.coin_distance = distance
+        self._coin_label = label
+
+    def _update_coin_distance(self, pos: list) -> None:
+        """
+        This function updates the distances after a coin is removed. Only the cells which were the nearest to the coin
+        change: they are collected with a flood fill from the coin, then their new distances are computed with a
+        Dijkstra search started from the cells around them.
+        :param pos: (x, y) coordinate pair of the removed coin
+        :return: None
+        """
+        distance = self.coin_distance.reshape(-1)
+        label = self._coin_label.reshape(-1)
+        neighbors = self._neighbors
+        no_coin = self.map_size * self.map_size
+
+        source = pos[0] * self.map_size + pos[1]
+        region = [source]
+        label[source] = -1
+        for cell in region:
+            for neighbor in neighbors[cell]:
+                if label[neighbor] == source:
+                    label[neighbor] = -1
+                    region.append(neighbor)
+        distance[region] = no_coin
+
+        heap = []
+        for cell in region:
+            for neighbor in neighbors[cell]:
+                if label[neighbor] != -1:
+                    heap.append((int(distance[neighbor]) + 1, cell, int(label[neighbor])))
+        heapq.heapify(heap)
+        while heap:
+            cell_distance, cell, coin = heapq.heappop(heap)
+            if cell_distance >= distance[cell]:
+                continue
+            distance[cell] = cell_distance
+            label[cell] = coin
+            for neighbor in neighbors[cell]:
+                if cell_distance + 1 < distance[neighbor]:
+                    heapq.heappush(heap, (cell_distance + 1, neighbor, coin))
@@ -0,0 +1,169 @@
+from typing import Dict, Tuple, Union
+import numpy as np
+
+from pacman_env import ACTION_SPACE_SIZE, COIN, EMPTY, ENTITY_STATE_VALUES, GHOST
+
+# (row, col) displacement of PacMan for each action in order up/right/down/left
+MOVES = np.array([[-1, 0], [0, 1], [1, 0], [0, -1]])
+
+
+class PacmanVecEnv:
+    """
+    ---------------------------------
+    Batched Pacman Environment Class
+    ---------------------------------
+
+    Steps num_envs independent Pacman games (see pacman_env.Pacman) at once, keeping every game in NumPy arrays
+    (struct of arrays) and advancing all of them with array operations. The transitions of a game are the same as the
+    ones of Pacman.step. Finished games are not reset automatically, reset(mask) resets only the selected ones.
+
+
+    Attributes:
+        num_envs : int
+            number of games stepped together
+        map_size : int
+            size of the square map's one side
+        pos : ndarray
+            (num_envs, 2) array of PacMan's (x, y) coordinates in each game
+        orientation : ndarray
+            (num_envs,) array of PacMan's facing direction in each game
+        ghosts_pos : ndarray
+            (num_envs, num_ghosts, 2) array of the ghosts' (x, y) coordinates
+        entity_grid : ndarray
+            (num_envs, map_size, map_size) array of the coins and ghosts (EMPTY/COIN/GHOST) of each game
+        num_coins_left : ndarray
+            (num_envs,) array of the coins not collected yet in each game
+        step_counter : ndarray
+            (num_envs,) array of the executed steps of each game
+        score : ndarray
+            (num_envs,) array of the points acquired in each game
+        state : ndarray
+            (num_envs, map_size, map_size) array of the game states, updated in place
+        rng : numpy.random.Generator
+            random generator of the generated positions and orientations
+
+
+    Methods:
+        __init__(self, num_envs: int, map_size: int = 30, max_step: int = 100, num_ghosts: int = 4,
+                 num_coins: int = 100, score_coin: int = 10, seed: int | None = None) -> None
+        reset(self, mask: numpy.ndarray | None = None, copy: bool = True) -> numpy.ndarray
+        step(self, actions: numpy.ndarray, copy: bool = True) -> Tuple[numpy.ndarray, numpy.ndarray,
+                                                                       numpy.ndarray, Dict[str, numpy.ndarray]]
+        _generate_pos(self, envs: numpy.ndarray) -> None
+    """
+    def __init__(self, num_envs: int, map_size: int = 30, max_step: int = 100, num_ghosts: int = 4,
+                 num_coins: int = 100, score_coin: int = 10, seed: Union[int, None] = None) -> None:
+        """
+        Constructs the arrays of the games and resets all of them.
+        :return: None
+        """
+        if 1 + num_ghosts + num_coins > map_size * map_size:
+            raise ValueError("There are only {0} spots on the map!".format(map_size * map_size))
+        self.num_envs = num_envs
+        self.map_size = map_size
+        self.max_step = max_step
+        self.num_ghosts = num_ghosts
+        self.num_coins = num_coins
+        self.score_coin = score_coin
+        self.rng = np.random.default_rng(seed)
+        self._envs = np.arange(num_envs)
+
+        self.pos = np.zeros((num_envs, 2), dtype=np.intp)
+        self.orientation = np.zeros(num_envs, dtype=np.intp)
+        self.ghosts_pos = np.zeros((num_envs, num_ghosts, 2), dtype=np.intp)
+        self.entity_grid = np.zeros((num_envs, map_size, map_size), dtype=np.int8)
+        self.num_coins_left = np.zeros(num_envs, dtype=np.intp)
+        self.step_counter = np.zeros(num_envs, dtype=np.intp)
+        self.score = np.zeros(num_envs, dtype=np.intp)
+        self.state = np.zeros((num_envs, map_size, map_size))
+
+        self.reset()
+
+    def reset(self, mask: Union[np.ndarray, None] = None, copy: bool = True) -> np.ndarray:
+        """
+        This function resets the games selected by the mask with newly generated positions.
+        :param mask: boolean array of shape (num_envs,), all the games are reset if None
+        :param copy: if False, the state array of the environment itself is returned, which changes in the next steps
+        :return: current states of all the games
+        """
+        envs = self._envs if mask is None else np.flatnonzero(mask)
+        if len(envs) > 0:
+            self.step_counter[envs] = 0
+            self.score[envs] = 0
+            self.orientation[envs] = self.rng.integers(ACTION_SPACE_SIZE, size=len(envs))
+            self._generate_pos(envs)
+
+            self.state[envs] = ENTITY_STATE_VALUES[self.entity_grid[envs]]
+            self.state[envs, self.pos[envs, 0], self.pos[envs, 1]] = 1
+
+        return self.state.copy() if copy else self.state
+
+    def step(self, actions: np.ndarray, copy: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                                                    Dict[str, np.ndarray]]:
+        """
+        This function moves every game one step forward with its own action.
+        :param actions: integer array of shape (num_envs,) with the actions 0/1/2/3 corresponding to the directions in
+            order up/right/down/left
+        :param copy: if False, the state array of the environment itself is returned without copying, which changes
+            in the next steps
+        :return:
+            next_states : ndarray
+                states of the games after the actions
+            rewards : ndarray
+                quantification of the state transitions ###(To be implemented...)###
+            dones : ndarray
+                True for the terminated games
+            info : dict
+                contains the acquired scores ('score') and the executed steps ('step_counter') of the games
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError("Please enter {0} actions!".format(self.num_envs))
+        if ((actions < 0) | (actions >= ACTION_SPACE_SIZE)).any():
+            raise ValueError("Please enter numbers in the [0; {0}) interval!".format(ACTION_SPACE_SIZE))
+
+        # moving PacMan, the left cells show what is under PacMan again
+        rows, cols = self.pos[:, 0], self.pos[:, 1]
+        self.state[self._envs, rows, cols] = ENTITY_STATE_VALUES[self.entity_grid[self._envs, rows, cols]]
+        self.orientation[:] = actions
+        self.pos += MOVES[actions]
+        self.pos %= self.map_size
+        self.step_counter += 1
+        rows, cols = self.pos[:, 0], self.pos[:, 1]
+        self.state[self._envs, rows, cols] = 1
+
+        rewards = np.zeros(self.num_envs)
+        entities = self.entity_grid[self._envs, rows, cols]
+        dones = (self.step_counter > self.max_step) | (entities == GHOST)
+
+        # collecting the coins
+        eating = entities == COIN
+        self.score[eating] += self.score_coin
+        self.num_coins_left[eating] -= 1
+        self.entity_grid[eating, rows[eating], cols[eating]] = EMPTY
+
+        info = {"score": self.score.copy(), "step_counter": self.step_counter.copy()}
+        return (self.state.copy() if copy else self.state), rewards, dones, info
+
+    def _generate_pos(self, envs: np.ndarray) -> None:
+        """
+        This function generates PacMan, the ghosts and the coins at distinct random spots of the selected games.
+        :param envs: indices of the games
+        :return: None
+        """
+        num_objects = 1 + self.num_ghosts + self.num_coins
+        # the cells with the smallest random keys are taken, in the order of their keys
+        keys = self.rng.random((len(envs), self.map_size * self.map_size))
+        cells = np.argpartition(keys, num_objects - 1, axis=1)[:, :num_objects]
+        cells = np.take_along_axis(cells, np.argsort(np.take_along_axis(keys, cells, axis=1), axis=1), axis=1)
+        rows, cols = np.divmod(cells, self.map_size)
+
+        self.pos[envs, 0], self.pos[envs, 1] = rows[:, 0], cols[:, 0]
+        self.ghosts_pos[envs, :, 0] = rows[:, 1:1 + self.num_ghosts]
+        self.ghosts_pos[envs, :, 1] = cols[:, 1:1 + self.num_ghosts]
+
+        self.entity_grid[envs] = EMPTY
+        env_index = envs[:, np.newaxis]
+        self.entity_grid[env_index, rows[:, 1:1 + self.num_ghosts], cols[:, 1:1 + self.num_ghosts]] = GHOST
+        self.entity_grid[env_index, rows[:, 1 + self.num_ghosts:], cols[:, 1 + self.num_ghosts:]] = COIN
+        self.num_coins_left[envs] = self.num_coins
@@ -0,0 +1,83 @@
+from collections import deque
+
+import numpy as np
+
+from pacman_env import COIN, Pacman
+
+
+def bfs_coin_distance(env):
+    """
+    Reference distance field, computed with a plain multi-source BFS from scratch.
+    """
+    size = env.map_size
+    distance = np.full((size, size), size * size)
+    queue = deque()
+    for row, col in np.argwhere(env.entity_grid == COIN):
+        distance[row, col] = 0
+        queue.append((row, col))
+    while queue:
+        row, col = queue.popleft()
+        for d_row, d_col in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+            neighbor = ((row + d_row) % size, (col + d_col) % size)
+            if distance[neighbor] > distance[row, col] + 1:
+                distance[neighbor] = distance[row, col] + 1
+                queue.append(neighbor)
+    return distance
+
+
+def test_coin_distance_is_updated_after_every_eaten_coin():
+    rng = np.random.default_rng(2)
+    for map_size, num_coins in ((6, 3), (9, 20), (15, 60)):
+        env = Pacman(map_size=map_size, num_coins=num_coins, num_ghosts=0, max_step=2000, reward_mode="shaped")
+        assert np.array_equal(env.coin_distance, bfs_coin_distance(env))
+        eaten = 0
+        while len(env.coins_pos) > 0:
+            coins_before = len(env.coins_pos)
+            _, _, done, _ = env.step(int(rng.integers(4)))
+            if len(env.coins_pos) < coins_before:
+                eaten += 1
+                assert np.array_equal(env.coin_distance, bfs_coin_distance(env)), (map_size, eaten)
+            assert not done
+        assert eaten == num_coins and (env.coin_distance == map_size * map_size).all()
+
+
+def test_shaped_reward_is_the_coin_and_the_distance_decrease():
+    rng = np.random.default_rng(5)
+    env = Pacman(map_size=12, num_coins=30, max_step=400, reward_mode="shaped")
+    for _ in range(2000):
+        distance_before = env.coin_distance[env.pos[0], env.pos[1]]
+        action = int(rng.integers(4))
+        d_row, d_col = ((-1, 0), (0, 1), (1, 0), (0, -1))[action]
+        new_pos = ((env.pos[0] + d_row) % 12, (env.pos[1] + d_col) % 12)
+        expected = (env.score_coin if env.entity_grid[new_pos] == COIN else 0) + \
+            float(distance_before - env.coin_distance[new_pos])
+        _, reward, done, _ = env.step(action)
+        assert reward == expected
+        if done:
+            env.reset()
+
+
+def test_default_reward_mode_gives_no_reward():
+    env = Pacman(map_size=10, num_coins=20)
+    assert env.step(1)[1] == 0.0 and env.coin_distance is None
+
+
+def test_repainted_image_matches_the_upscaled_state():
+    rng = np.random.default_rng(8)
+    # 100 is not a multiple of 7, the last cells also cover the remainder of the image
+    for image_size, map_size in ((100, 7), (96, 8)):
+        env = Pacman(image_size=image_size, map_size=map_size, num_coins=10, num_ghosts=2, max_step=30)
+        for _ in range(3):
+            for _ in range(40):
+                image = env.render("rgb_array")
+                expected = np.repeat(env._upscale(env.state)[:, :, np.newaxis], 3, axis=2)
+                assert image.shape == (image_size, image_size, 3) and image.dtype == np.uint8
+                assert np.array_equal(image, expected), (image_size, env.step_counter)
+                assert (image[-1, -1] == round(env.state[-1, -1] * 255)).all()
+                _, _, done, _ = env.step(int(rng.integers(4)))
+                if done:
+                    break
+            # the image drawn before the reset is repainted too
+            env.reset()
+            assert np.array_equal(env.render("rgb_array"),
+                                  np.repeat(env._upscale(env.state)[:, :, np.newaxis], 3, axis=2))
@@ -0,0 +1,56 @@
+import numpy as np
+
+from pacman_env import COIN, GHOST, Pacman
+from pacman_vec_env import PacmanVecEnv
+
+
+def mirror(vec_env, index):
+    """
+    Creates a Pacman environment in the same situation as one game of the batched environment.
+    """
+    env = Pacman(map_size=vec_env.map_size, max_step=vec_env.max_step, num_ghosts=vec_env.num_ghosts,
+                 num_coins=vec_env.num_coins, score_coin=vec_env.score_coin)
+    env.entity_grid[...] = vec_env.entity_grid[index]
+    env.pos = [int(value) for value in vec_env.pos[index]]
+    env.ghosts_pos = [[int(row), int(col)] for row, col in vec_env.ghosts_pos[index]]
+    env.coins_pos = [[int(row), int(col)] for row, col in np.argwhere(env.entity_grid == COIN)]
+    env._coin_index = {tuple(pos): i for i, pos in enumerate(env.coins_pos)}
+    env.orientation = int(vec_env.orientation[index])
+    env.step_counter = int(vec_env.step_counter[index])
+    env.score = int(vec_env.score[index])
+    env.state = env._update_map()
+    return env
+
+
+def test_vec_env_matches_pacman_game_by_game():
+    num_envs = 16
+    vec_env = PacmanVecEnv(num_envs, map_size=10, max_step=60, num_coins=40, seed=3)
+    states = vec_env.reset()
+    envs = [mirror(vec_env, i) for i in range(num_envs)]
+    for i in range(num_envs):
+        assert np.array_equal(states[i], envs[i].state)
+
+    rng = np.random.default_rng(0)
+    ghost_dones = step_dones = coins = 0
+    for _ in range(1000):
+        actions = rng.integers(4, size=num_envs)
+        states, _, dones, info = vec_env.step(actions)
+        for i, env in enumerate(envs):
+            coins_before = len(env.coins_pos)
+            state, reward, done, _ = env.step(int(actions[i]))
+            assert np.array_equal(state, states[i]) and done == dones[i]
+            assert env.score == info["score"][i] and len(env.coins_pos) == vec_env.num_coins_left[i]
+            coins += coins_before - len(env.coins_pos)
+            if done:
+                ghost_dones += env.entity_grid[env.pos[0], env.pos[1]] == GHOST
+                step_dones += env.step_counter > env.max_step
+
+        if dones.any():
+            kept_states = states[~dones]
+            states = vec_env.reset(dones)
+            assert np.array_equal(states[~dones], kept_states), "Only the finished games should be reset."
+            for i in np.flatnonzero(dones):
+                assert vec_env.step_counter[i] == 0 and vec_env.num_coins_left[i] == vec_env.num_coins
+                envs[i] = mirror(vec_env, i)
+    assert coins > 0 and ghost_dones > 0 and step_dones > 0, \
+        "The games should collect coins, and end both by ghosts and by the step limit."
@@ -0,0 +1,52 @@
+"""
+Frame stacking wrapper for the Snake environment
+"""
+import numpy as np
+
+from snake import OBS_MODES
+
+
+class FrameStack:
+    """
+    Wraps a Snake and returns its last k observations stacked, from the oldest to the newest.
+    The observations are written into a preallocated ring buffer, every other attribute is
+    forwarded to the wrapped game.
+    """
+    def __init__(self, env, k):
+        self.env = env
+        self.k = k
+        obs_size = env.obs_size
+        dtype = OBS_MODES[env.obs_mode][0]
+        self._frames = np.zeros((k, obs_size), dtype=dtype)
+        # index of the newest frame in the ring buffer
+        self._newest = 0
+        self._stacked = np.zeros((k, obs_size), dtype=dtype)
+        # frame order (oldest first) for each possible index of the newest frame
+        self._orders = (np.arange(1, k + 1)[:, None] + np.arange(k)[None, :]) % k
+
+    def __getattr__(self, attr):
+        return getattr(self.env, attr)
+
+    def reset(self, *args, copy=True, **kwargs):
+        """
+        Resets the game and fills every frame with the first observation
+        :return: stacked observations of shape (k, obs_size)
+        """
+        self._newest = 0
+        self.env.reset(*args, out=self._frames[0], **kwargs)
+        self._frames[1:] = self._frames[0]
+        return self._create_stack(copy)
+
+    def step(self, action, copy=True):
+        self._newest = (self._newest + 1) % self.k
+        _, reward, done, info = self.env.step(action, out=self._frames[self._newest])
+        return self._create_stack(copy), reward, done, info
+
+    def step_n(self, actions, repeat=1, copy=True):
+        self._newest = (self._newest + 1) % self.k
+        _, reward, done, info = self.env.step_n(actions, repeat, out=self._frames[self._newest])
+        return self._create_stack(copy), reward, done, info
+
+    def _create_stack(self, copy):
+        np.take(self._frames, self._orders[self._newest], axis=0, out=self._stacked)
+        return self._stacked.copy() if copy else self._stacked
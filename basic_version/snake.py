@@ -2,34 +2,227 @@
 created by Laszlo Szoke
 laszlo.szoke@hu.bosch.com
 """
+from collections import namedtuple
+
 import cv2
 import numpy as np
 
+# compact snapshot of a game: flat cell indices (row * map_size + col) of the body from the tail to the head
+# and of the objects, plus the scalar game variables
+SnakeState = namedtuple("SnakeState", ("body", "objects", "dir", "size", "step_", "rng_state"))
+
+# map components, indexing the rows of the observation palettes
+EMPTY, OBJECT, BODY, HEAD = range(4)
+# observation modes: dtype and the channel values of the empty cells, objects, body and head
+#   float - grayscale float64 image (the original observation)
+#   uint8 - the same grayscale image as uint8
+#   planes - uint8 0/1 planes of the body (including the head), the head and the objects
+#   packed - the planes packed into bits
+OBS_MODES = {
+    "float": (np.float64, [[0], [0.25], [1], [0.8]]),
+    "uint8": (np.uint8, [[0], [64], [255], [204]]),
+    "planes": (np.uint8, [[0, 0, 0], [0, 0, 1], [1, 0, 0], [1, 1, 0]]),
+    "packed": (np.uint8, [[0, 0, 0], [0, 0, 1], [1, 0, 0], [1, 1, 0]]),
+}
+
+
+def observation_size(map_size, obs_mode="float"):
+    """
+    :return: number of elements of the flattened observation in the given mode
+    """
+    size = map_size * map_size * len(OBS_MODES[obs_mode][1][0])
+    if obs_mode == "packed":
+        return (size + 7) // 8
+    return size
+
+
+def run_steps(advance, actions, repeat=1):
+    """
+    Applies each action repeat times, stopping at the end of the game
+    :param advance: function executing one step with an action, returning the reward and done
+    :return: summed reward, done, number of executed steps
+    """
+    if np.ndim(actions) == 0:
+        actions = (actions,)
+    total_score = 0
+    is_dead = False
+    steps = 0
+    for action in actions:
+        for _ in range(repeat):
+            score, is_dead = advance(action)
+            total_score += score
+            steps += 1
+            if is_dead:
+                return total_score, is_dead, steps
+    return total_score, is_dead, steps
+
 
 class Snake:
-    def __init__(self, map_size):
+    def __init__(self, map_size, show_img_size=300, seed=None, obs_mode="float"):
         self.map_size = map_size
-        # lists for the map components
-        self.body = []
-        self.objects = []
+        # own random generator, so parallel games are reproducible independently of each other
+        self.rng = np.random.default_rng(seed)
+        # ring buffer for the body parts (the tail is at index self._tail) and occupancy grids for the map components
+        self._ring = [None] * (self.map_size * self.map_size)
+        self._tail = 0
+        self._length = 0
+        self._body_grid = np.zeros((self.map_size, self.map_size), dtype=bool)
+        self._object_grid = np.zeros((self.map_size, self.map_size), dtype=bool)
+        # index of the free cells (neither body nor object): the first self._num_free elements of self._free
+        # are the free flat cell indices, self._free_pos is the position of each cell in self._free
+        self._free = np.arange(self.map_size * self.map_size)
+        self._free_pos = np.arange(self.map_size * self.map_size)
+        self._num_free = len(self._free)
+        # observation of the current state, updated in place at every change of the map
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"Unknown observation mode {obs_mode}, choose from {list(OBS_MODES)}.")
+        self.obs_mode = obs_mode
+        self.obs_size = observation_size(self.map_size, obs_mode)
+        dtype, palette = OBS_MODES[obs_mode]
+        self._palette = np.array(palette, dtype=dtype)
+        self._obs = np.zeros((self.map_size, self.map_size, self._palette.shape[1]), dtype=dtype)
         # initiate default values
         self.step_ = 0
         self.dir = 1
         self.size = 5
         self.last_obs = None
+        # objects created by the last reset or step
+        self.spawns = []
         # Variables for visualizing the current grid world
-        self.show_img_size = 300
-        self.show_img = np.zeros((self.show_img_size, self.show_img_size, 3))
-        self.ratio = int(self.show_img_size / self.map_size)
+        self.show_img_size = show_img_size
+        # grid row (and column) of each pixel row (and column) for nearest-neighbour upscaling
+        self._show_idx = np.arange(self.show_img_size) * self.map_size // self.show_img_size
         self.reset()
 
-    def step(self, action):
+    @property
+    def body(self):
+        """
+        The body parts from the tail to the head
+        """
+        return [self._ring[(self._tail + i) % len(self._ring)] for i in range(self._length)]
+
+    @property
+    def objects(self):
+        return [tuple(coords) for coords in np.argwhere(self._object_grid)]
+
+    @property
+    def head(self):
+        return self._ring[(self._tail + self._length - 1) % len(self._ring)]
+
+    @property
+    def length(self):
+        return self._length
+
+    def get_state(self):
+        """
+        Creates a compact snapshot of the game, which can be restored with set_state
+        :return: SnakeState
+        """
+        body = np.fromiter((x * self.map_size + y for x, y in self.body), dtype=np.int32, count=self._length)
+        objects = np.flatnonzero(self._object_grid).astype(np.int32)
+        return SnakeState(body, objects, self.dir, self.size, self.step_, self.rng.bit_generator.state)
+
+    def set_state(self, state):
+        """
+        Restores a snapshot created by get_state
+        :param state: SnakeState
+        :return: None
+        """
+        self._body_grid[:] = False
+        self._object_grid[:] = False
+        self._obs[:] = 0
+
+        rows, cols = np.divmod(state.objects, self.map_size)
+        self._object_grid[rows, cols] = True
+        self._obs[rows, cols] = self._palette[OBJECT]
+
+        rows, cols = np.divmod(state.body, self.map_size)
+        self._ring[:len(state.body)] = zip(rows.tolist(), cols.tolist())
+        self._tail = 0
+        self._length = len(state.body)
+        self._body_grid[rows, cols] = True
+        self._obs[rows, cols] = self._palette[BODY]
+        self._obs[rows[-1], cols[-1]] = self._palette[HEAD]
+
+        self.dir = state.dir
+        self.size = state.size
+        self.step_ = state.step_
+        self.rng.bit_generator.state = state.rng_state
+        self.last_obs = self._obs if self.step_ > 0 else None
+
+        # free cells first, then the occupied ones
+        occupied = (self._body_grid | self._object_grid).reshape(-1)
+        self._free = np.concatenate((np.flatnonzero(~occupied), np.flatnonzero(occupied)))
+        self._free_pos[self._free] = np.arange(len(self._free))
+        self._num_free = len(self._free) - int(occupied.sum())
+
+    def clone(self):
+        """
+        Creates an independent copy of the game, sharing only the immutable variables
+        :return: Snake
+        """
+        clone = object.__new__(Snake)
+        clone.__dict__ = self.__dict__.copy()
+        clone.rng = np.random.Generator(type(self.rng.bit_generator)())
+        clone.rng.bit_generator.state = self.rng.bit_generator.state
+        clone._ring = self._ring.copy()
+        clone._free = self._free.copy()
+        clone._free_pos = self._free_pos.copy()
+        clone._body_grid = self._body_grid.copy()
+        clone._object_grid = self._object_grid.copy()
+        clone._obs = self._obs.copy()
+        clone.spawns = self.spawns.copy()
+        if self.last_obs is not None:
+            clone.last_obs = clone._obs
+        return clone
+
+    def step(self, action, out=None, copy=True):
+        """
+        Moves the snake one step forward
+        :param action: 0/1/2/3 corresponding to the directions up/right/down/left
+        :param out: optional buffer with obs_size elements (see observation_size) to write the observation into
+        :param copy: if False, a read-only view of the internal observation is returned, which is
+            updated by the next step
+        :return: observation, reward, done, info
+        """
+        if self.spawns:
+            self.spawns = []
+        score, is_dead = self._advance(action)
+
+        # placeholder for additional information
+        info = None
+
+        return self._create_observation(out, copy), score, is_dead, info
+
+    def step_n(self, actions, repeat=1, out=None, copy=True):
+        """
+        Moves the snake several steps forward in one call, stopping at the end of the game.
+        The observation is created only once, after the last step.
+        :param actions: an action or a sequence of actions (0/1/2/3)
+        :param repeat: number of times each action is applied
+        :param out: optional buffer with obs_size elements (see observation_size) to write the observation into
+        :param copy: if False, a read-only view of the internal observation is returned
+        :return: observation, summed reward, done, info with the number of executed steps under 'steps'
+        """
+        if self.spawns:
+            self.spawns = []
+        total_score, is_dead, steps = run_steps(self._advance, actions, repeat)
+
+        info = {"steps": steps}
+
+        return self._create_observation(out, copy), total_score, is_dead, info
+
+    def _advance(self, action):
+        """
+        The game logic of one step, updating the map and the observation in place
+        :return: reward and done
+        """
         # setting base reward
         score = 0
         # setting basic env status
         is_dead = False
         # getting the current head position (always the last body part)
-        pos_x, pos_y = self.body[-1]
+        pos_x, pos_y = self.head
 
         # get new head position
         if self.dir == 0:
@@ -48,34 +241,29 @@ class Snake:
         y = self._check_walls(y)
 
         # add current step to the body
-        if (x, y) not in self.body:
-            self.body.append((x, y))
+        if not self._body_grid[x, y]:
+            self._append_head(x, y)
         # if the current pos is in the body, we bit ourselves, game over
         else:
             is_dead = True
             score = -1
 
         # checking for object to eat
-        if (x, y) in self.objects:
+        if self._object_grid[x, y]:
             # increase size due to feeding
             self.size += 1
             score = 1
-            self.objects.remove((x, y))
+            self._object_grid[x, y] = False
+            # the eaten object is already covered by the head in the observation
             # self._create_objects(num=1) # use this line for generating new object if one is eaten
 
         # check the length
-        if len(self.body) > self.size:
+        if self._length > self.size:
             # remove last body part if exceeds size
-            self.body.pop(0)
-
-        # create observation
-        obs = self._create_observation()
+            self._pop_tail()
 
         # save observation
-        self.last_obs = obs
-
-        # placeholder for additional information
-        info = None
+        self.last_obs = self._obs
 
         # count the steps of the game
         self.step_ += 1
@@ -84,7 +272,7 @@ class Snake:
         if self.step_ > 100:
             is_dead = True
 
-        return obs.flatten(), score, is_dead, info
+        return score, is_dead
 
     def _going_right(self, action, pos_x, pos_y):
         # going up
@@ -143,6 +331,41 @@ class Snake:
             raise NotImplementedError
         return pos_x, pos_y
 
+    def _append_head(self, x, y):
+        if self._length > 0:
+            head_x, head_y = self.head
+            self._obs[head_x, head_y] = self._palette[BODY]
+        self._ring[(self._tail + self._length) % len(self._ring)] = (x, y)
+        self._length += 1
+        self._body_grid[x, y] = True
+        self._obs[x, y] = self._palette[HEAD]
+        # the cell of an object is already out of the free cells
+        if not self._object_grid[x, y]:
+            self._occupy(x * self.map_size + y)
+
+    def _pop_tail(self):
+        x, y = self._ring[self._tail]
+        self._tail = (self._tail + 1) % len(self._ring)
+        self._length -= 1
+        self._body_grid[x, y] = False
+        self._obs[x, y] = self._palette[EMPTY]
+        self._release(x * self.map_size + y)
+
+    def _occupy(self, cell):
+        # swap the cell with the last free one and shrink the free part
+        self._num_free -= 1
+        self._swap_free(self._free_pos[cell], self._num_free)
+
+    def _release(self, cell):
+        # swap the cell with the first occupied one and grow the free part
+        self._swap_free(self._free_pos[cell], self._num_free)
+        self._num_free += 1
+
+    def _swap_free(self, i, j):
+        cell_i, cell_j = self._free[i], self._free[j]
+        self._free[i], self._free[j] = cell_j, cell_i
+        self._free_pos[cell_i], self._free_pos[cell_j] = j, i
+
     def _check_walls(self, coord):
         # checking the limit at max
         if coord == self.map_size:
@@ -154,66 +377,99 @@ class Snake:
         else:
             return coord
 
-    def _create_observation(self):
+    def _create_observation(self, out=None, copy=True):
         """
-        This funtion creates a grayscale observation (image) from the current state of the game.
+        This funtion returns the flattened observation (image) of the current state of the game.
+        In the default float mode the objects are 0.25, the body is 1 and the head is 0.8 on the image.
+        :param out: optional buffer to copy the observation into
+        :param copy: if False, a read-only view of the internal observation is returned
         :return:
         """
-        # init map
-        obs_ = np.zeros((self.map_size, self.map_size, 1))
-
-        # add objects
-        for obj in self.objects:
-            obs_[obj[0], obj[1], 0] = 0.25
-        # add snake body
-        for piece in self.body:
-            obs_[piece[0], piece[1], 0] = 1
-        # mark head
-        head_coord = self.body[-1]
-        obs_[head_coord[0], head_coord[1], 0] = 0.8
-        return obs_
-
-    def reset(self):
-        self.body = []
-        self.objects = []
+        obs_ = self._obs.reshape(-1)
+        if self.obs_mode == "packed":
+            obs_ = np.packbits(obs_)
+        if out is not None:
+            np.copyto(out, obs_.reshape(out.shape))
+            return out
+        if not copy:
+            obs_.flags.writeable = False
+            return obs_
+        return obs_.copy()
+
+    def reset(self, seed=None, out=None, copy=True):
+        """
+        Starts a new game
+        :param seed: if given, the random generator of the game is reseeded with it
+        :param out: optional buffer to copy the observation into
+        :param copy: if False, a read-only view of the internal observation is returned
+        :return: observation
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._free[:] = np.arange(len(self._free))
+        self._free_pos[:] = self._free
+        self._num_free = len(self._free)
+        self._tail = 0
+        self._length = 0
+        self._body_grid[:] = False
+        self._object_grid[:] = False
+        self._obs[:] = 0
         self.dir = 1
         self.size = 5
         self.step_ = 0
         self.last_obs = None
+        self.spawns = []
 
         self._create_body()
         self._create_objects(num=10)
-        obs_ = self._create_observation()
-        return obs_.flatten()
+        return self._create_observation(out, copy)
 
     def render(self, mode="human"):
         """
         This function creates a cv2 plot from the current game state
-        :param mode: not used, legacy of gym environments
-        :return:
+        :param mode: "human" shows the image in a cv2 window,
+            "rgb_array" returns it as a uint8 array of shape (show_img_size, show_img_size, 3) without any window
+        :return: the image in "rgb_array" mode, otherwise None
         """
+        if mode == "rgb_array":
+            return self._create_image()
+        elif mode == "human":
+            if self.last_obs is not None:
+                cv2.imshow("Snake Env", self._create_image())
+                # add wait to see the game
+                cv2.waitKey(50)
+        else:
+            raise NotImplementedError
 
-        if self.last_obs is not None:
-            img = np.float32(self.last_obs)
-            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
-            # rescale original image from the grid world to visualize with OpenCv
-            for i in range(self.show_img_size):
-                for j in range(self.show_img_size):
-                    self.show_img[i][j] = img[i // self.ratio][j // self.ratio]
-            cv2.imshow("Snake Env", self.show_img)
-            # add wait to see the game
-            cv2.waitKey(50)
+    def _create_image(self):
+        # grayscale image of the grid world, the same in every observation mode
+        gray = np.array(OBS_MODES["uint8"][1], dtype=np.uint8)[:, 0]
+        grid = np.zeros((self.map_size, self.map_size), dtype=np.uint8)
+        grid[self._object_grid] = gray[OBJECT]
+        grid[self._body_grid] = gray[BODY]
+        grid[self.head] = gray[HEAD]
+        # rescale original image from the grid world with nearest-neighbour upscaling
+        img = grid[self._show_idx[:, None], self._show_idx[None, :]]
+        return np.repeat(img[:, :, None], 3, axis=2)
 
     def _create_body(self):
-        self.body.append((0, 0))
+        self._append_head(0, 0)
         self.size = 5
 
     def _create_objects(self, num):
-        for _ in range(num):
-            coords = tuple(np.random.randint(0, self.map_size, (2,)))
-            while coords in self.objects or coords in self.body:
-                coords = tuple(np.random.randint(0, self.map_size, (2,)))
-            self.objects.append(coords)
+        # the map may not have room for every object
+        num = min(num, self._num_free)
+        # the indices into the shrinking free part are drawn with one generator call,
+        # SnakeVecEnv draws them in the same way
+        draws = self.rng.integers(self._num_free - np.arange(num)).tolist()
+        for index in draws:
+            # sampling directly from the free cells
+            cell = int(self._free[index])
+            self._occupy(cell)
+            x, y = divmod(cell, self.map_size)
+            self._object_grid[x, y] = True
+            self._obs[x, y] = self._palette[OBJECT]
+            self.spawns.append((x, y))
 
 
 if __name__ == "__main__":
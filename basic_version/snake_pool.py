@@ -0,0 +1,209 @@
+"""
+Multi-process rollout pool for the Snake environment, each worker process owns a shard of the games
+"""
+import multiprocessing as mp
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from snake import OBS_MODES, observation_size
+from snake_vec_env import SnakeVecEnv
+
+# commands and replies between the parent and the workers, sent as raw bytes, so nothing is pickled per step
+STEP = b"step"
+RESET = b"reset"
+CLOSE = b"close"
+OK = b"ok"
+ERROR = b"error:"
+
+
+def _layout(num_envs, map_size, obs_mode):
+    """
+    Places the arrays in the shared memory block, each offset is aligned to the item size of its array
+    :return: (shape, dtype, offset) of the actions, observations, rewards, dones and terminal observations,
+        and the size of the block
+    """
+    obs_shape = (num_envs, observation_size(map_size, obs_mode))
+    obs_dtype = np.dtype(OBS_MODES[obs_mode][0])
+    arrays = [((num_envs,), np.dtype(np.int64)), (obs_shape, obs_dtype), ((num_envs,), np.dtype(np.int64)),
+              ((num_envs,), np.dtype(bool)), (obs_shape, obs_dtype)]
+    layout = []
+    offset = 0
+    for shape, dtype in arrays:
+        offset = -(-offset // dtype.itemsize) * dtype.itemsize
+        layout.append((shape, dtype, offset))
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return layout, offset
+
+
+def _create_buffers(buf, num_envs, map_size, obs_mode):
+    """
+    Creates the array views of the shared memory block
+    :return: actions, observations, rewards, dones and terminal observations (the last observations of the games
+        finished in the step, in their rows)
+    """
+    layout, _ = _layout(num_envs, map_size, obs_mode)
+    return tuple(np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset) for shape, dtype, offset in layout)
+
+
+def _buffer_size(num_envs, map_size, obs_mode):
+    _, size = _layout(num_envs, map_size, obs_mode)
+    return size
+
+
+def _worker(conn, shm_name, num_envs, map_size, obs_mode, start, stop, seed):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        actions, obs, rewards, dones, terminal_obs = _create_buffers(shm.buf, num_envs, map_size, obs_mode)
+        try:
+            env = SnakeVecEnv(stop - start, map_size, seed=None if seed is None else seed + start,
+                              obs_mode=obs_mode)
+        except Exception:
+            conn.send_bytes(ERROR + traceback.format_exc().encode())
+            return
+        conn.send_bytes(OK)
+        while True:
+            command = conn.recv_bytes()
+            if command == CLOSE:
+                break
+            try:
+                if command == STEP:
+                    obs[start:stop], rewards[start:stop], dones[start:stop], info = env.step(actions[start:stop])
+                    terminal_obs[start:stop][dones[start:stop]] = info["terminal_obs"]
+                elif command == RESET:
+                    obs[start:stop] = env.reset()
+                    rewards[start:stop] = 0
+                    dones[start:stop] = False
+                else:
+                    raise ValueError(f"Unknown command {command!r}.")
+            except Exception:
+                conn.send_bytes(ERROR + traceback.format_exc().encode())
+            else:
+                conn.send_bytes(OK)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # drop the views before closing the shared memory
+        actions = obs = rewards = dones = terminal_obs = None
+        shm.close()
+        conn.close()
+
+
+class SnakeRolloutPool:
+    """
+    Runs num_workers processes with envs_per_worker Snake games each (as a SnakeVecEnv shard).
+    The actions, observations, rewards and dones are exchanged through one shared memory block.
+    With a seed, the i-th game behaves as Snake(map_size, seed=seed + i, obs_mode=obs_mode).
+    """
+    def __init__(self, num_workers, envs_per_worker, map_size, seed=None, obs_mode="float", start_method=None):
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"Unknown observation mode {obs_mode}, choose from {list(OBS_MODES)}.")
+        self.num_workers = num_workers
+        self.num_envs = num_workers * envs_per_worker
+        self.map_size = map_size
+        self.obs_mode = obs_mode
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_buffer_size(self.num_envs, map_size, obs_mode))
+        self._actions, self._obs, self._rewards, self._dones, self._terminal_obs = \
+            _create_buffers(self._shm.buf, self.num_envs, map_size, obs_mode)
+        self._conns = []
+        self._processes = []
+        self.closed = False
+
+        ctx = mp.get_context(start_method)
+        try:
+            for worker in range(num_workers):
+                parent_conn, child_conn = ctx.Pipe()
+                start = worker * envs_per_worker
+                process = ctx.Process(target=_worker,
+                                      args=(child_conn, self._shm.name, self.num_envs, map_size, obs_mode,
+                                            start, start + envs_per_worker, seed),
+                                      daemon=True)
+                process.start()
+                child_conn.close()
+                self._conns.append(parent_conn)
+                self._processes.append(process)
+            self._wait()
+        except BaseException:
+            self.close()
+            raise
+
+    def reset(self, copy=True):
+        """
+        Resets every game
+        :param copy: if False, the view of the shared observations is returned, which is overwritten by the next call
+        :return: stacked observations of shape (num_envs, obs_size)
+        """
+        self._send(RESET)
+        return self._obs.copy() if copy else self._obs
+
+    def step(self, actions, copy=True):
+        """
+        Advances every game with its own action, finished games are reset automatically
+        :param actions: integer array of shape (num_envs,) with the actions 0/1/2/3
+        :param copy: if False, views of the shared buffers are returned, which are overwritten by the next call
+        :return: stacked observations, rewards and dones, and an info dict holding the last
+            observations of the finished games under 'terminal_obs', as SnakeVecEnv.step
+        """
+        self._raise_if_closed()
+        self._actions[:] = actions
+        self._send(STEP)
+        info = {"terminal_obs": self._terminal_obs[self._dones]}
+        if copy:
+            return self._obs.copy(), self._rewards.copy(), self._dones.copy(), info
+        return self._obs, self._rewards, self._dones, info
+
+    def close(self):
+        """
+        Stops the workers and frees the shared memory
+        :return: None
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            try:
+                conn.send_bytes(CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for conn in self._conns:
+            conn.close()
+        self._actions = self._obs = self._rewards = self._dones = self._terminal_obs = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _raise_if_closed(self):
+        if self.closed:
+            raise RuntimeError("The pool is already closed.")
+
+    def _send(self, command):
+        self._raise_if_closed()
+        for conn in self._conns:
+            conn.send_bytes(command)
+        self._wait()
+
+    def _wait(self):
+        # every worker has to answer, so the pipes stay in sync even if some of them failed
+        errors = []
+        for worker, conn in enumerate(self._conns):
+            try:
+                reply = conn.recv_bytes()
+            except EOFError:
+                errors.append(f"Worker {worker} exited unexpectedly.")
+                continue
+            if reply.startswith(ERROR):
+                errors.append(f"Worker {worker} failed:\n{reply[len(ERROR):].decode()}")
+        if errors:
+            raise RuntimeError("\n".join(errors))
@@ -0,0 +1,189 @@
+"""
+Episode recorder and replayer for the Snake environment, using an append-only, memory-mapped file
+"""
+import os
+from collections import deque
+
+import numpy as np
+
+from snake import BODY, EMPTY, HEAD, OBJECT, OBS_MODES, run_steps
+
+# file header: magic bytes and the map size
+MAGIC = b"SNAKEREC"
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("map_size", "<u4"), ("reserved", "<u4")])
+
+# one record per reset, step and spawned object, the observations are rebuilt from them
+RESET = 0
+STEP = 1
+SPAWN = 2
+RECORD_DTYPE = np.dtype([("kind", "u1"), ("action", "i1"), ("reward", "i1"), ("flags", "u1"),
+                         ("x", "<i2"), ("y", "<i2")])
+
+# bits of the flags field of the step records
+DONE = 1
+TAIL_REMOVED = 2
+
+
+class SnakeRecorder:
+    """
+    Wraps a Snake and streams the actions, rewards, head positions and spawned objects of its episodes
+    into a file, every other attribute is forwarded to the wrapped game
+    """
+    def __init__(self, env, path, buffer_size=4096):
+        self.env = env
+        self.path = path
+        self._buffer = np.zeros(buffer_size, dtype=RECORD_DTYPE)
+        self._num_buffered = 0
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            header = np.array([(MAGIC, env.map_size, 0)], dtype=HEADER_DTYPE)
+            self._file.write(header.tobytes())
+            self._file.flush()
+        else:
+            map_size = _read_header(path)
+            if map_size != env.map_size:
+                self._file.close()
+                raise ValueError(f"{path} was recorded with map size {map_size}, not {env.map_size}.")
+
+    def __getattr__(self, attr):
+        return getattr(self.env, attr)
+
+    def reset(self, *args, **kwargs):
+        obs = self.env.reset(*args, **kwargs)
+        x, y = self.env.head
+        self._write(RESET, 0, 0, 0, x, y)
+        self._write_spawns()
+        return obs
+
+    def step(self, action, *args, **kwargs):
+        length = self.env.length
+        obs, reward, done, info = self.env.step(action, *args, **kwargs)
+        x, y = self.env.head
+        flags = DONE if done else 0
+        # the head is not added if the snake bit itself
+        if reward != -1 and self.env.length == length:
+            flags |= TAIL_REMOVED
+        self._write(STEP, action, reward, flags, x, y)
+        self._write_spawns()
+        return obs, reward, done, info
+
+    def step_n(self, actions, repeat=1, out=None, copy=True):
+        # every step is recorded, so the steps are executed one by one,
+        # the observation is created once at the end (also when no step was executed)
+        total_reward, done, steps = run_steps(self._record_step, actions, repeat)
+        return self.env._create_observation(out, copy), total_reward, done, {"steps": steps}
+
+    def _record_step(self, action):
+        _, reward, done, _ = self.step(action, copy=False)
+        return reward, done
+
+    def flush(self):
+        self._buffer[:self._num_buffered].tofile(self._file)
+        self._num_buffered = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _write_spawns(self):
+        for x, y in self.env.spawns:
+            self._write(SPAWN, 0, 0, 0, x, y)
+
+    def _write(self, kind, action, reward, flags, x, y):
+        if self._num_buffered == len(self._buffer):
+            self.flush()
+        self._buffer[self._num_buffered] = (kind, action, reward, flags, x, y)
+        self._num_buffered += 1
+
+
+class SnakeReplay:
+    """
+    Reads a file written by SnakeRecorder through a memory map and regenerates the observations on demand
+    in any observation mode of Snake
+    """
+    def __init__(self, path, obs_mode="float"):
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"Unknown observation mode {obs_mode}, choose from {list(OBS_MODES)}.")
+        self.path = path
+        self.obs_mode = obs_mode
+        self.map_size = _read_header(path)
+        if os.path.getsize(path) > HEADER_DTYPE.itemsize:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize)
+        else:
+            # an empty file can not be memory-mapped
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        # record index of the start of each episode
+        self._starts = np.append(np.flatnonzero(self.records["kind"] == RESET), len(self.records))
+
+    def __len__(self):
+        return len(self._starts) - 1
+
+    def episode(self, index):
+        """
+        :param index: index of the episode
+        :return: memory-mapped records of the episode
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"There is no episode {index}, the file has {len(self)}.")
+        index %= len(self)
+        return self.records[self._starts[index]:self._starts[index + 1]]
+
+    def actions(self, index):
+        records = self.episode(index)
+        return np.asarray(records["action"][records["kind"] == STEP])
+
+    def rewards(self, index):
+        records = self.episode(index)
+        return np.asarray(records["reward"][records["kind"] == STEP])
+
+    def observations(self, index, copy=True):
+        """
+        Rebuilds the observations of an episode, in the same form as Snake.reset and Snake.step returned them
+        :param index: index of the episode
+        :param copy: if False, the same read-only buffer is yielded every time, updated in place
+        :return: generator of the observation after the reset and after each step
+        """
+        dtype, palette = OBS_MODES[self.obs_mode]
+        palette = np.array(palette, dtype=dtype)
+        obs = np.zeros((self.map_size, self.map_size, palette.shape[1]), dtype=dtype)
+        flat_obs = obs.reshape(-1)
+        view = flat_obs.view()
+        view.flags.writeable = False
+        body = deque()
+        records = self.episode(index)
+        kinds = records["kind"]
+        for i in range(len(records)):
+            kind, _, reward, flags, x, y = records[i].item()
+            if kind == RESET:
+                body.append((x, y))
+                obs[x, y] = palette[HEAD]
+            elif kind == SPAWN:
+                obs[x, y] = palette[OBJECT]
+            elif reward != -1:
+                head_x, head_y = body[-1]
+                obs[head_x, head_y] = palette[BODY]
+                body.append((x, y))
+                obs[x, y] = palette[HEAD]
+                if flags & TAIL_REMOVED:
+                    obs[body.popleft()] = palette[EMPTY]
+            # the spawns of a reset or step are recorded right after it
+            if i + 1 == len(records) or kinds[i + 1] != SPAWN:
+                if self.obs_mode == "packed":
+                    yield np.packbits(flat_obs)
+                else:
+                    yield flat_obs.copy() if copy else view
+
+
+def _read_header(path):
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header["magic"][0] != MAGIC:
+        raise ValueError(f"{path} is not a Snake recording.")
+    return int(header["map_size"][0])
@@ -0,0 +1,192 @@
+"""
+Batched version of the Snake environment (basic_version/snake.py), stepping N games at once
+"""
+import numpy as np
+
+from snake import BODY, EMPTY, HEAD, OBJECT, OBS_MODES, observation_size
+
+# head displacement on the grid for each direction: 0 - up, 1 - right, 2 - down, 3 - left
+DIR_DX = np.array([0, 1, 0, -1])
+DIR_DY = np.array([1, 0, -1, 0])
+
+
+class SnakeVecEnv:
+    """
+    Keeps N independent Snake games in NumPy arrays and advances all of them with one step call.
+    The transitions are the same as the ones of Snake.step, finished games are reset automatically.
+    With a seed, the i-th game behaves as Snake(map_size, seed=seed + i, obs_mode=obs_mode).
+    """
+    def __init__(self, num_envs, map_size, seed=None, obs_mode="float"):
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"Unknown observation mode {obs_mode}, choose from {list(OBS_MODES)}.")
+        self.num_envs = num_envs
+        self.map_size = map_size
+        self.num_cells = map_size * map_size
+        self.obs_mode = obs_mode
+        self.obs_size = observation_size(map_size, obs_mode)
+        self.rngs = self._create_rngs(seed)
+        self._rows = np.arange(num_envs)
+        # ring buffers for the flat cell indices of the body parts, the tail is at index self.tail
+        self.body = np.zeros((num_envs, self.num_cells), dtype=np.int32)
+        self.tail = np.zeros(num_envs, dtype=np.intp)
+        self.length = np.zeros(num_envs, dtype=np.intp)
+        self.head = np.zeros(num_envs, dtype=np.intp)
+        # occupancy grids of the body and the objects
+        self.body_grid = np.zeros((num_envs, self.num_cells), dtype=bool)
+        self.object_grid = np.zeros((num_envs, self.num_cells), dtype=bool)
+        # free cell index of each game, the same as the one of Snake
+        self.free = np.zeros((num_envs, self.num_cells), dtype=np.int32)
+        self.free_pos = np.zeros((num_envs, self.num_cells), dtype=np.int32)
+        self.num_free = np.zeros(num_envs, dtype=np.intp)
+        # initiate default values
+        self.dir = np.ones(num_envs, dtype=np.intp)
+        self.size = np.full(num_envs, 5, dtype=np.intp)
+        self.step_ = np.zeros(num_envs, dtype=np.intp)
+        # observations of the cells, updated in place
+        dtype, palette = OBS_MODES[obs_mode]
+        self._palette = np.array(palette, dtype=dtype)
+        self.obs = np.zeros((num_envs, self.num_cells, self._palette.shape[1]), dtype=dtype)
+        self.reset()
+
+    def reset(self, mask=None, seed=None):
+        """
+        Resets the games selected by the mask (all of them by default)
+        :param mask: boolean array of shape (num_envs,)
+        :param seed: if given, the random generators of all the games are reseeded with it
+        :return: stacked observations of shape (num_envs, obs_size)
+        """
+        if seed is not None:
+            self.rngs = self._create_rngs(seed)
+        if mask is None:
+            self._reset_envs(self._rows)
+        else:
+            self._reset_envs(np.flatnonzero(mask))
+        return self._create_observations(self._rows)
+
+    def step(self, actions):
+        """
+        Advances every game with its own action
+        :param actions: integer array of shape (num_envs,) with the actions 0/1/2/3
+        :return: stacked observations, rewards and dones, and an info dict holding the last
+            observations of the finished games under 'terminal_obs'
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got an array of shape {actions.shape}.")
+        if ((actions < 0) | (actions > 3)).any():
+            raise NotImplementedError
+
+        # the direction changes only if the action is perpendicular to it
+        turning = actions % 2 != self.dir % 2
+        self.dir = np.where(turning, actions, self.dir)
+
+        # get new head position, going through the walls
+        x = (self.head // self.map_size + DIR_DX[self.dir]) % self.map_size
+        y = (self.head % self.map_size + DIR_DY[self.dir]) % self.map_size
+        cells = x * self.map_size + y
+
+        # if the new head is in the body, we bit ourselves, game over
+        bit_itself = self.body_grid[self._rows, cells]
+        alive = np.flatnonzero(~bit_itself)
+        new_heads = cells[alive]
+
+        # add current step to the body
+        self.obs[alive, self.head[alive]] = self._palette[BODY]
+        self.body[alive, (self.tail[alive] + self.length[alive]) % self.num_cells] = new_heads
+        self.length[alive] += 1
+        self.body_grid[alive, new_heads] = True
+        self.head[alive] = new_heads
+        self.obs[alive, new_heads] = self._palette[HEAD]
+        on_object = self.object_grid[alive, new_heads]
+        self._occupy(alive[~on_object], new_heads[~on_object])
+
+        # checking for object to eat
+        eaten = alive[on_object]
+        self.object_grid[eaten, self.head[eaten]] = False
+        self.size[eaten] += 1
+
+        # remove last body part if exceeds size
+        too_long = alive[self.length[alive] > self.size[alive]]
+        tails = self.body[too_long, self.tail[too_long]]
+        self.body_grid[too_long, tails] = False
+        self.obs[too_long, tails] = self._palette[EMPTY]
+        self.tail[too_long] = (self.tail[too_long] + 1) % self.num_cells
+        self.length[too_long] -= 1
+        self._release(too_long, tails)
+
+        reward = np.zeros(self.num_envs, dtype=np.int64)
+        reward[eaten] = 1
+        reward[bit_itself] = -1
+
+        # count the steps of the games, terminating them after some step
+        self.step_ += 1
+        done = bit_itself | (self.step_ > 100)
+
+        obs = self._create_observations(self._rows)
+        finished = np.flatnonzero(done)
+        info = {"terminal_obs": obs[finished]}
+        if len(finished):
+            self._reset_envs(finished)
+            obs[finished] = self._create_observations(finished)
+        return obs, reward, done, info
+
+    def _create_observations(self, envs):
+        # flattened observations of the given games, the same as the ones of Snake in the same mode
+        obs = self.obs[envs].reshape(len(envs), -1)
+        if self.obs_mode == "packed":
+            return np.packbits(obs, axis=1)
+        return obs
+
+    def _reset_envs(self, envs):
+        self.body_grid[envs] = False
+        self.object_grid[envs] = False
+        self.dir[envs] = 1
+        self.size[envs] = 5
+        self.step_[envs] = 0
+        self.free[envs] = np.arange(self.num_cells)
+        self.free_pos[envs] = np.arange(self.num_cells)
+        self.num_free[envs] = self.num_cells
+
+        # the body starts with the single (0, 0) cell
+        self.body[envs, 0] = 0
+        self.tail[envs] = 0
+        self.length[envs] = 1
+        self.head[envs] = 0
+        self.body_grid[envs, 0] = True
+        self._occupy(envs, np.zeros(len(envs), dtype=np.intp))
+
+        self._create_objects(envs, num=10)
+        self.obs[envs] = np.where(self.object_grid[envs, :, None], self._palette[OBJECT], self._palette[EMPTY])
+        self.obs[envs, self.head[envs]] = self._palette[HEAD]
+
+    def _create_objects(self, envs, num):
+        # sampling from the free cells in the same way as Snake._create_objects: one generator call
+        # per game, then the objects are placed in all the games together.
+        # The games are just reset, so they have the same number of free cells.
+        num_free = int(self.num_free[envs[0]])
+        num = min(num, num_free)
+        bounds = num_free - np.arange(num)
+        draws = np.stack([self.rngs[env].integers(bounds) for env in envs])
+        for index in draws.T:
+            cells = self.free[envs, index]
+            self._occupy(envs, cells)
+            self.object_grid[envs, cells] = True
+
+    def _occupy(self, envs, cells):
+        # each game appears at most once in envs
+        self.num_free[envs] -= 1
+        self._swap_free(envs, self.free_pos[envs, cells], self.num_free[envs])
+
+    def _release(self, envs, cells):
+        self._swap_free(envs, self.free_pos[envs, cells], self.num_free[envs])
+        self.num_free[envs] += 1
+
+    def _swap_free(self, envs, i, j):
+        cells_i, cells_j = self.free[envs, i], self.free[envs, j]
+        self.free[envs, i], self.free[envs, j] = cells_j, cells_i
+        self.free_pos[envs, cells_i], self.free_pos[envs, cells_j] = j, i
+
+    def _create_rngs(self, seed):
+        if seed is None:
+            return [np.random.default_rng() for _ in range(self.num_envs)]
+        return [np.random.default_rng(seed + i) for i in range(self.num_envs)]
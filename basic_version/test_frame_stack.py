@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from frame_stack import FrameStack
+from snake import OBS_MODES, Snake
+
+
+@pytest.mark.parametrize("obs_mode", list(OBS_MODES))
+def test_frames_are_stacked_from_the_oldest_after_wrapping_around(obs_mode):
+    k = 3
+    stack = FrameStack(Snake(8, seed=2, obs_mode=obs_mode), k)
+    snake = Snake(8, seed=2, obs_mode=obs_mode)
+    history = [snake.reset()] * k
+    assert np.array_equal(stack.reset(), np.stack(history))
+    # several times around the ring buffer
+    for action in [1, 1, 2, 2, 3, 2, 1, 1]:
+        stacked, reward, done, _ = stack.step(action)
+        obs, snake_reward, snake_done, _ = snake.step(action)
+        assert reward == snake_reward and done == snake_done
+        history = history[1:] + [obs]
+        assert np.array_equal(stacked, np.stack(history))
+    stacked, _, _, _ = stack.step_n([2, 3], repeat=2)
+    obs, _, _, _ = snake.step_n([2, 3], repeat=2)
+    history = history[1:] + [obs]
+    assert np.array_equal(stacked, np.stack(history))
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from snake import Snake
+
+
+@pytest.mark.parametrize("repeat", [1, 3])
+def test_step_n_matches_repeated_steps(repeat):
+    actions = np.random.RandomState(5).randint(0, 4, 200)
+    snake, stepped = Snake(8, seed=1), Snake(8, seed=1)
+    snake.reset()
+    stepped.reset()
+    for start in range(0, len(actions), 4):
+        chunk = actions[start:start + 4]
+        obs, reward, done, info = snake.step_n(chunk, repeat)
+        total_reward, steps = 0, 0
+        for action in np.repeat(chunk, repeat):
+            stepped_obs, step_reward, stepped_done, _ = stepped.step(int(action))
+            total_reward += step_reward
+            steps += 1
+            if stepped_done:
+                break
+        assert info["steps"] == steps, "step_n should stop at the end of the game."
+        assert reward == total_reward and done == stepped_done
+        assert np.array_equal(obs, stepped_obs)
+        if done:
+            snake.reset()
+            stepped.reset()
+
+
+def test_step_n_without_steps_returns_the_current_observation():
+    snake = Snake(6, seed=0)
+    obs = snake.reset()
+    out = np.zeros(snake.obs_size)
+    for step_obs, reward, done, info in (snake.step_n([]), snake.step_n(1, repeat=0), snake.step_n([], out=out)):
+        assert np.array_equal(step_obs, obs)
+        assert (reward, done, info["steps"]) == (0, False, 0)
+    assert np.array_equal(out, obs)
+
+
+def play(snake, actions):
+    """
+    :return: the observations, rewards and dones of the steps, the game is reset when it ends
+    """
+    history = []
+    for action in actions:
+        obs, reward, done, _ = snake.step(int(action))
+        history.append((obs, reward, done))
+        if done:
+            history.append((snake.reset(), 0, False))
+    return history
+
+
+def assert_same_history(history, other):
+    assert len(history) == len(other)
+    for (obs, reward, done), (other_obs, other_reward, other_done) in zip(history, other):
+        assert np.array_equal(obs, other_obs)
+        assert reward == other_reward and done == other_done
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_set_state_restores_the_game(seed):
+    rng = np.random.RandomState(seed)
+    snake = Snake(6, seed=seed)
+    snake.reset()
+    play(snake, rng.randint(0, 4, 30))
+    state = snake.get_state()
+    obs = snake.step_n([])[0]
+    # the actions end the game and reset it, so the restored random generator is checked too
+    actions = rng.randint(0, 4, 150)
+    history = play(snake, actions)
+    assert any(done for _, _, done in history), "The actions should end the game."
+
+    snake.set_state(state)
+    assert np.array_equal(snake.step_n([])[0], obs)
+    assert_same_history(play(snake, actions), history)
+
+
+def test_clone_is_independent_of_the_original():
+    rng = np.random.RandomState(3)
+    snake = Snake(6, seed=3)
+    snake.reset()
+    play(snake, rng.randint(0, 4, 20))
+    state = snake.get_state()
+    obs = snake.step_n([])[0]
+    clone = snake.clone()
+    actions = rng.randint(0, 4, 150)
+
+    # playing with the clone (also resetting it) leaves the grids, the body ring and the random generator
+    # of the original as they were
+    clone_history = play(clone, actions)
+    assert any(done for _, _, done in clone_history)
+    after = snake.get_state()
+    assert np.array_equal(after.body, state.body) and np.array_equal(after.objects, state.objects)
+    assert after.rng_state == state.rng_state
+    assert np.array_equal(snake.step_n([])[0], obs)
+
+    # and the original plays the same game the clone played
+    assert_same_history(play(snake, actions), clone_history)
+    # which leaves the clone alone in turn
+    assert snake.rng.bit_generator.state == clone.rng.bit_generator.state
+    assert clone.rng is not snake.rng
+    clone.reset()
+    assert snake.rng.bit_generator.state != clone.rng.bit_generator.state
+
+
+def test_rgb_array_render_upscales_the_grid():
+    # 100 is not a multiple of 7, so the cells are 14 or 15 pixels wide
+    snake = Snake(7, show_img_size=100, seed=6, obs_mode="uint8")
+    widths = np.bincount(np.arange(100) * 7 // 100)
+    assert set(widths) == {14, 15} and widths.sum() == 100
+    obs = snake.reset()
+    for action in [1, 2, 2, 3, None]:
+        image = snake.render(mode="rgb_array")
+        assert image.shape == (100, 100, 3) and image.dtype == np.uint8
+        # the uint8 observation has the gray levels of the image, each cell is repeated over its pixels
+        expected = np.repeat(np.repeat(obs.reshape(7, 7), widths, axis=0), widths, axis=1)
+        for channel in range(3):
+            assert np.array_equal(image[:, :, channel], expected)
+        if action is not None:
+            obs, _, done, _ = snake.step(action)
+            assert not done
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from snake import OBS_MODES
+from snake_pool import SnakeRolloutPool, _create_buffers, _layout
+from snake_vec_env import SnakeVecEnv
+
+
+@pytest.mark.parametrize("obs_mode", list(OBS_MODES))
+def test_shared_arrays_are_aligned(obs_mode):
+    layout, size = _layout(1, 6, obs_mode)
+    buffers = _create_buffers(bytearray(size), 1, 6, obs_mode)
+    for (_, dtype, offset), array in zip(layout, buffers):
+        assert offset % dtype.itemsize == 0 and array.dtype == dtype
+
+
+@pytest.mark.parametrize("obs_mode", ["float", "packed"])
+def test_pool_matches_vec_env(obs_mode):
+    with SnakeRolloutPool(3, 4, 6, seed=1, obs_mode=obs_mode) as pool:
+        vec_env = SnakeVecEnv(12, 6, seed=1, obs_mode=obs_mode)
+        assert np.array_equal(pool.reset(), vec_env.reset())
+        rng = np.random.RandomState(0)
+        num_dones = 0
+        for _ in range(300):
+            actions = rng.randint(0, 4, 12)
+            obs, rewards, dones, info = pool.step(actions)
+            vec_obs, vec_rewards, vec_dones, vec_info = vec_env.step(actions)
+            assert np.array_equal(obs, vec_obs) and np.array_equal(rewards, vec_rewards)
+            assert np.array_equal(dones, vec_dones)
+            assert np.array_equal(info["terminal_obs"], vec_info["terminal_obs"])
+            num_dones += dones.sum()
+        assert num_dones > 0
+
+
+def test_worker_error_is_raised_and_pool_keeps_working():
+    with SnakeRolloutPool(2, 2, 6, seed=0) as pool:
+        pool.reset()
+        with pytest.raises(RuntimeError, match="Worker 1 failed"):
+            pool.step(np.array([0, 0, 0, 7]))
+        obs, _, _, _ = pool.step(np.zeros(4, dtype=int))
+        assert obs.shape == (4, 36)
+
+
+def test_close_stops_the_workers():
+    pool = SnakeRolloutPool(2, 2, 6, seed=0)
+    processes = list(pool._processes)
+    pool.close()
+    assert all(not process.is_alive() for process in processes)
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.step(np.zeros(4, dtype=int))
+    pool.close()
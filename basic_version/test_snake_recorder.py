@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from snake import OBS_MODES, Snake
+from snake_recorder import SnakeRecorder, SnakeReplay
+
+
+def test_recorder_step_n_matches_repeated_steps(tmp_path):
+    actions = np.random.RandomState(7).randint(0, 4, 120)
+    snake = Snake(8, seed=4)
+    snake.reset()
+    with SnakeRecorder(Snake(8, seed=4), tmp_path / "episodes.rec") as recorder:
+        recorder.reset()
+        for start in range(0, len(actions), 5):
+            chunk = actions[start:start + 5]
+            obs, reward, done, info = recorder.step_n(chunk, repeat=2)
+            snake_obs, snake_reward, snake_done, snake_info = snake.step_n(chunk, repeat=2)
+            assert info["steps"] == snake_info["steps"]
+            assert reward == snake_reward and done == snake_done
+            assert np.array_equal(obs, snake_obs)
+            if done:
+                recorder.reset()
+                snake.reset()
+
+
+def test_recorder_step_n_without_steps_returns_the_current_observation(tmp_path):
+    with SnakeRecorder(Snake(6, seed=0), tmp_path / "episodes.rec") as recorder:
+        obs = recorder.reset()
+        out = np.zeros(recorder.obs_size)
+        for step_obs, reward, done, info in (recorder.step_n([]), recorder.step_n(2, repeat=0),
+                                             recorder.step_n([], out=out)):
+            assert np.array_equal(step_obs, obs)
+            assert (reward, done, info["steps"]) == (0, False, 0)
+        assert np.array_equal(out, obs)
+
+
+def record_episodes(path, num_episodes, obs_mode="float", seed=0, map_size=6):
+    """
+    :return: the observations, actions and rewards of each recorded episode, as Snake returned them
+    """
+    rng = np.random.RandomState(seed)
+    episodes = []
+    with SnakeRecorder(Snake(map_size, seed=seed, obs_mode=obs_mode), path) as recorder:
+        for _ in range(num_episodes):
+            observations, actions, rewards = [recorder.reset()], [], []
+            done = False
+            while not done:
+                action = int(rng.randint(0, 4))
+                obs, reward, done, _ = recorder.step(action)
+                observations.append(obs)
+                actions.append(action)
+                rewards.append(reward)
+            episodes.append((observations, actions, rewards))
+    return episodes
+
+
+@pytest.mark.parametrize("obs_mode", list(OBS_MODES))
+def test_replay_rebuilds_the_recorded_episodes(tmp_path, obs_mode):
+    path = tmp_path / "episodes.rec"
+    episodes = record_episodes(path, 4, obs_mode)
+    replay = SnakeReplay(path, obs_mode)
+    assert len(replay) == len(episodes)
+    for i, (observations, actions, rewards) in enumerate(episodes):
+        assert np.array_equal(replay.actions(i), actions)
+        assert np.array_equal(replay.rewards(i), rewards)
+        replayed = list(replay.observations(i))
+        assert len(replayed) == len(observations)
+        for replayed_obs, obs in zip(replayed, observations):
+            assert np.array_equal(replayed_obs, obs)
+
+
+def test_recorder_appends_to_an_existing_file(tmp_path):
+    path = tmp_path / "episodes.rec"
+    episodes = record_episodes(path, 2, seed=0) + record_episodes(path, 3, seed=1)
+    replay = SnakeReplay(path)
+    assert len(replay) == 5
+    for i, (observations, actions, _) in enumerate(episodes):
+        assert np.array_equal(replay.actions(i), actions)
+        assert np.array_equal(list(replay.observations(i))[-1], observations[-1])
+
+
+def test_recorder_rejects_a_file_of_another_map_size(tmp_path):
+    path = tmp_path / "episodes.rec"
+    record_episodes(path, 1, map_size=6)
+    with pytest.raises(ValueError):
+        SnakeRecorder(Snake(7), path)
+    # the file is left as it was
+    assert len(SnakeReplay(path)) == 1
+
+
+def test_replay_of_a_file_without_episodes(tmp_path):
+    path = tmp_path / "episodes.rec"
+    SnakeRecorder(Snake(6), path).close()
+    replay = SnakeReplay(path)
+    assert len(replay) == 0
+    assert replay.map_size == 6
+    with pytest.raises(IndexError):
+        replay.episode(0)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from snake import OBS_MODES, Snake
+from snake_vec_env import SnakeVecEnv
+
+
+@pytest.mark.parametrize("obs_mode", list(OBS_MODES))
+def test_vec_env_matches_snake_with_the_same_seeds(obs_mode):
+    num_envs, map_size, seed = 7, 6, 3
+    snakes = [Snake(map_size, seed=seed + i, obs_mode=obs_mode) for i in range(num_envs)]
+    vec_env = SnakeVecEnv(num_envs, map_size, seed=seed, obs_mode=obs_mode)
+    assert np.array_equal(vec_env.reset(), np.stack([snake.reset() for snake in snakes]))
+
+    rng = np.random.RandomState(99)
+    num_dones = 0
+    for _ in range(2000):
+        actions = rng.randint(0, 4, num_envs)
+        obs, rewards, dones, info = vec_env.step(actions)
+        terminal_obs = []
+        for i, snake in enumerate(snakes):
+            snake_obs, reward, done, _ = snake.step(int(actions[i]))
+            assert reward == rewards[i] and done == dones[i]
+            if done:
+                # the finished games are reset automatically, their last observations are in the info
+                terminal_obs.append(snake_obs)
+                snake_obs = snake.reset()
+            assert np.array_equal(snake_obs, obs[i])
+        if terminal_obs:
+            assert np.array_equal(info["terminal_obs"], np.stack(terminal_obs))
+        num_dones += len(terminal_obs)
+    assert num_dones > 0, "The random actions should finish some games."
+
+
+def test_reset_mask_resets_only_the_selected_games():
+    vec_env = SnakeVecEnv(4, 6, seed=0)
+    vec_env.reset()
+    obs, _, _, _ = vec_env.step(np.ones(4, dtype=int))
+    mask = np.array([True, False, True, False])
+    reset_obs = vec_env.reset(mask)
+    assert np.array_equal(reset_obs[~mask], obs[~mask])
+    assert (vec_env.step_[mask] == 0).all()
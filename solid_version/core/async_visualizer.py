@@ -0,0 +1,124 @@
+import threading
+from typing import List
+
+from bosch_ASDIIE.solid_version.core.canvas import Canvas
+from bosch_ASDIIE.solid_version.core.map import Coordinates
+from bosch_ASDIIE.solid_version.core.visualizable import Visualizable
+from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
+
+
+class SnapshotCanvas(Canvas):
+    """
+    Canvas copying the drawn dots into a frame, instead of drawing them.
+    The camera center of the canvas is captured with the frame, so the frame is drawn where it was
+    when the snapshot was taken. It has no viewport, the viewport is created when the frame is drawn.
+    """
+    def __init__(self, canvas: Canvas):
+        self.canvas = canvas
+        self.frame: List[List[Coordinates]] = []
+        self.camera_center = canvas.get_camera_center()
+
+    def draw_dots(self, coordinates: List[Coordinates]):
+        self.frame.append(list(coordinates))
+
+    def render(self):
+        pass
+
+    def clear(self):
+        self.frame = []
+
+    def get_height(self):
+        return self.canvas.get_height()
+
+    def get_width(self):
+        return self.canvas.get_width()
+
+
+class AsyncVisualizer(Visualizer):
+    """
+    Visualizer drawing on the canvas in a side-thread, so slow screen I/O does not delay the ticks.
+    render only snapshots the drawn dots into a back buffer, and the render thread draws the latest
+    snapshot on the canvas. When the thread lags behind, the frames it could not draw are dropped.
+    """
+    def __init__(self,
+                 visualizable_objects: List[Visualizable],
+                 canvas: Canvas):
+        super().__init__(visualizable_objects, canvas)
+        self.thread = None
+        self.stopped = False
+        self.error = None
+        self.rendered_frames = 0
+        self.dropped_frames = 0
+        # the latest snapshot which is not drawn yet
+        self._back = None
+        self._rendering = False
+        self._condition = threading.Condition()
+
+    def render(self):
+        self._raise_error()
+        if self.thread is None:
+            self.start()
+        snapshot = SnapshotCanvas(self.canvas)
+        for obj in self.visualizable_objects:
+            obj.draw(snapshot)
+        with self._condition:
+            if self._back is not None:
+                self.dropped_frames += 1
+            self._back = snapshot
+            self._condition.notify_all()
+
+    def start(self):
+        self.stopped = False
+        self.thread = threading.Thread(target=self.render_loop, daemon=True)
+        self.thread.start()
+
+    def flush(self):
+        """
+        Waits until the latest snapshot is on the canvas
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.error is not None or
+                                     (self._back is None and not self._rendering))
+        self._raise_error()
+
+    def stop(self):
+        """
+        Draws the latest snapshot, then stops the render thread
+        """
+        if self.thread is None:
+            return
+        with self._condition:
+            self.stopped = True
+            self._condition.notify_all()
+        self.thread.join()
+        self.thread = None
+        self._raise_error()
+
+    def render_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._back is not None or self.stopped)
+                if self._back is None:
+                    return
+                snapshot, self._back = self._back, None
+                self._rendering = True
+            try:
+                # the game state may be ticks ahead by now, the camera follows the snapshot
+                self.canvas.set_camera_center(snapshot.camera_center)
+                self.canvas.clear()
+                for dots in snapshot.frame:
+                    self.canvas.draw_dots(dots)
+                self.canvas.render()
+            except Exception as error:
+                self.error = error
+            with self._condition:
+                self._rendering = False
+                self._condition.notify_all()
+                if self.error is not None:
+                    self._back = None
+                    return
+                self.rendered_frames += 1
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError("AsyncVisualizer stopped with an error.") from self.error
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from bosch_ASDIIE.solid_version.core.map import Coordinates
+from bosch_ASDIIE.solid_version.core.viewport import Viewport
 
 
 class Canvas(ABC):
@@ -24,3 +25,23 @@ class Canvas(ABC):
     @abstractmethod
     def get_width(self):
         pass
+
+    def get_camera_center(self) -> Coordinates:
+        """
+        :return: the map coordinates the next frame would be centered on, None if the canvas has no camera
+        """
+        return None
+
+    def set_camera_center(self, center: Coordinates):
+        """
+        Centers the next frame on the given map coordinates, instead of asking the camera at clear,
+        e.g. when the frame is drawn later than its state was captured
+        """
+        pass
+
+    def get_viewport(self) -> Viewport:
+        """
+        :return: the visible part of the map, the drawables can leave out the dots outside of it,
+            None if the whole map is visible
+        """
+        return None
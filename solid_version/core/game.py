@@ -1,7 +1,7 @@
-import time
-
+from bosch_ASDIIE.solid_version.core.instrumentation import PhaseTimer, instrument
 from bosch_ASDIIE.solid_version.core.key_listener import KeyboardListener
 from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
+from bosch_ASDIIE.solid_version.core.tick_scheduler import TickScheduler
 from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
 
 
@@ -15,19 +15,31 @@ class Game:
                  keyboard_listener: KeyboardListener,
                  game_state: SnakeGameState,
                  visualizer: Visualizer,
+                 scheduler: TickScheduler = None,
+                 phase_timer: PhaseTimer = None,
                  ):
 
         self.keyboard_listener = keyboard_listener
         self.game_state = game_state
         self.visualizer = visualizer
+        if scheduler is None:
+            scheduler = TickScheduler(self.GAME_SPEED)
+        self.scheduler = scheduler
+        # the phases of the loop are only timed with a phase timer
+        self.phase_timer = phase_timer
+        if phase_timer is not None:
+            self.keyboard_listener = instrument(phase_timer, game_state, visualizer, keyboard_listener)
 
     def run(self):
         can_continue = True
+        self.scheduler.start()
         while can_continue:
             if self.keyboard_listener.has_happened():
                 key_event = self.keyboard_listener.read_last_key_event()
                 self.game_state.take_action(key_event)
             self.game_state.step()
             can_continue = not self.game_state.is_terminated()
-            self.visualizer.render()
-            time.sleep(self.GAME_SPEED)
+            # the last frame is always shown
+            if self.scheduler.should_render() or not can_continue:
+                self.visualizer.render()
+            self.scheduler.wait_next_tick()
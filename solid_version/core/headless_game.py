@@ -0,0 +1,52 @@
+import time
+from collections import namedtuple
+
+from bosch_ASDIIE.solid_version.core.input_source import InputSource
+from bosch_ASDIIE.solid_version.core.instrumentation import PhaseTimer, instrument
+from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
+from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
+
+HeadlessReport = namedtuple("HeadlessReport", ("ticks", "seconds", "ticks_per_second", "termination_reason"))
+
+
+class HeadlessGame:
+    """
+    Class for running the game as fast as possible without a terminal, e.g. for soak tests and fuzzing.
+    The key events of the input source go straight into the game state and there is no sleeping.
+    """
+    def __init__(self,
+                 input_source: InputSource,
+                 game_state: SnakeGameState,
+                 visualizer: Visualizer = None,
+                 max_ticks: int = None,
+                 phase_timer: PhaseTimer = None,
+                 ):
+        self.input_source = input_source
+        self.game_state = game_state
+        self.visualizer = visualizer
+        self.max_ticks = max_ticks
+        self.phase_timer = phase_timer
+        if phase_timer is not None:
+            self.input_source = instrument(phase_timer, game_state, visualizer, input_source)
+
+    def run(self) -> HeadlessReport:
+        ticks = 0
+        start = time.perf_counter()
+        while not self.game_state.is_terminated() and \
+                (self.max_ticks is None or ticks < self.max_ticks):
+            if self.input_source.has_happened():
+                self.game_state.take_action(self.input_source.read_last_key_event())
+            self.game_state.step()
+            if self.visualizer is not None:
+                self.visualizer.render()
+            ticks += 1
+        seconds = time.perf_counter() - start
+
+        if self.game_state.is_terminated():
+            # the timing proxies are not shown in the reason
+            terminated_by = getattr(self.game_state.terminated_by, "game_element", self.game_state.terminated_by)
+            reason = f"{type(terminated_by).__name__} terminated the game"
+        else:
+            reason = "tick limit reached"
+        ticks_per_second = ticks / seconds if seconds > 0 else float("inf")
+        return HeadlessReport(ticks, seconds, ticks_per_second, reason)
@@ -0,0 +1,54 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+
+
+class InputSource(ABC):
+    """
+    Source of the key events of the game, read once per tick
+    """
+    @abstractmethod
+    def has_happened(self) -> bool:
+        pass
+
+    @abstractmethod
+    def read_last_key_event(self) -> KeyEvent:
+        pass
+
+
+class ScriptedInput(InputSource):
+    """
+    Input source replaying a script with one entry per tick, None meaning no key event in that tick
+    """
+    def __init__(self, script: Iterable[Optional[KeyEvent]]):
+        self.script = iter(script)
+        self.next_key_event = None
+
+    def has_happened(self) -> bool:
+        self.next_key_event = next(self.script, None)
+        return self.next_key_event is not None
+
+    def read_last_key_event(self) -> KeyEvent:
+        if self.next_key_event is None:
+            raise ValueError("ScriptedInput has no key event in this tick.")
+        key_event = self.next_key_event
+        self.next_key_event = None
+        return key_event
+
+
+class RandomInput(InputSource):
+    """
+    Input source pressing a random key with the given probability in each tick
+    """
+    def __init__(self, key_probability: float = 0.3, seed: int = None):
+        self.key_probability = key_probability
+        self.random = random.Random(seed)
+        self.key_events = list(KeyEvent)
+
+    def has_happened(self) -> bool:
+        return self.random.random() < self.key_probability
+
+    def read_last_key_event(self) -> KeyEvent:
+        return self.random.choice(self.key_events)
@@ -0,0 +1,183 @@
+import signal
+import sys
+import time
+from array import array
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, TextIO
+
+from bosch_ASDIIE.solid_version.core.canvas import Canvas
+from bosch_ASDIIE.solid_version.core.game_element import GameElement
+from bosch_ASDIIE.solid_version.core.input_source import InputSource
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import Coordinates
+from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
+from bosch_ASDIIE.solid_version.core.visualizable import Visualizable
+from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
+
+PhaseSummary = namedtuple("PhaseSummary", ("count", "p50", "p95", "p99", "max"))
+
+
+class PhaseTimer:
+    """
+    Collects the durations of the phases of the game loop, keeping the last `capacity` ones
+    of each phase in a ring buffer
+    """
+    def __init__(self, capacity: int = 4096, clock: Callable[[], float] = time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self._durations: Dict[str, array] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, phase: str, seconds: float):
+        count = self._counts.get(phase)
+        if count is None:
+            self._durations[phase] = array("d", bytes(8 * self.capacity))
+            count = 0
+        self._durations[phase][count % self.capacity] = seconds
+        self._counts[phase] = count + 1
+
+    def summary(self) -> Dict[str, PhaseSummary]:
+        summaries = {}
+        for phase, count in self._counts.items():
+            durations = sorted(self._durations[phase][:min(count, self.capacity)])
+            summaries[phase] = PhaseSummary(count,
+                                            self._percentile(durations, 0.50),
+                                            self._percentile(durations, 0.95),
+                                            self._percentile(durations, 0.99),
+                                            durations[-1])
+        return summaries
+
+    def report(self) -> str:
+        lines = [f"{'phase':<32}{'count':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for phase, summary in self.summary().items():
+            lines.append(f"{phase:<32}{summary.count:>10}"
+                         f"{summary.p50 * 1e3:>10.3f}{summary.p95 * 1e3:>10.3f}"
+                         f"{summary.p99 * 1e3:>10.3f}{summary.max * 1e3:>10.3f}")
+        return "\n".join(lines)
+
+    def dump(self, stream: TextIO = None):
+        print(self.report(), file=sys.stderr if stream is None else stream, flush=True)
+
+    def install_signal_handler(self, signum: int = None, stream: TextIO = None) -> bool:
+        """
+        Dumps the report whenever the process gets the signal
+        :param signum: SIGUSR1 by default, where the platform has it (not on Windows)
+        :return: whether the handler was installed
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+            if signum is None:
+                return False
+        signal.signal(signum, lambda *_: self.dump(stream))
+        return True
+
+    @staticmethod
+    def _percentile(sorted_durations: List[float], quantile: float) -> float:
+        return sorted_durations[round(quantile * (len(sorted_durations) - 1))]
+
+
+class TimedInputSource(InputSource):
+    def __init__(self, input_source: InputSource, timer: PhaseTimer):
+        self.input_source = input_source
+        self.timer = timer
+
+    def has_happened(self) -> bool:
+        start = self.timer.clock()
+        happened = self.input_source.has_happened()
+        self.timer.record("input.poll", self.timer.clock() - start)
+        return happened
+
+    def read_last_key_event(self) -> KeyEvent:
+        start = self.timer.clock()
+        key_event = self.input_source.read_last_key_event()
+        self.timer.record("input.read", self.timer.clock() - start)
+        return key_event
+
+
+class TimedGameElement(GameElement):
+    def __init__(self, game_element: GameElement, timer: PhaseTimer, name: str):
+        self.game_element = game_element
+        self.timer = timer
+        self.take_action_phase = f"take_action:{name}"
+        self.tick_phase = f"tick:{name}"
+
+    def take_action(self, key_event: KeyEvent):
+        start = self.timer.clock()
+        self.game_element.take_action(key_event)
+        self.timer.record(self.take_action_phase, self.timer.clock() - start)
+
+    def tick(self) -> bool:
+        start = self.timer.clock()
+        can_continue = self.game_element.tick()
+        self.timer.record(self.tick_phase, self.timer.clock() - start)
+        return can_continue
+
+
+class TimedVisualizable(Visualizable):
+    def __init__(self, visualizable: Visualizable, timer: PhaseTimer, name: str):
+        self.visualizable = visualizable
+        self.timer = timer
+        self.draw_phase = f"draw:{name}"
+
+    def draw(self, canvas: Canvas):
+        start = self.timer.clock()
+        self.visualizable.draw(canvas)
+        self.timer.record(self.draw_phase, self.timer.clock() - start)
+
+
+class TimedCanvas(Canvas):
+    def __init__(self, canvas: Canvas, timer: PhaseTimer):
+        self.canvas = canvas
+        self.timer = timer
+
+    def draw_dots(self, coordinates: List[Coordinates]):
+        self.canvas.draw_dots(coordinates)
+
+    def render(self):
+        start = self.timer.clock()
+        self.canvas.render()
+        self.timer.record("canvas.render", self.timer.clock() - start)
+
+    def clear(self):
+        start = self.timer.clock()
+        self.canvas.clear()
+        self.timer.record("canvas.clear", self.timer.clock() - start)
+
+    def get_height(self):
+        return self.canvas.get_height()
+
+    def get_width(self):
+        return self.canvas.get_width()
+
+    def get_viewport(self):
+        return self.canvas.get_viewport()
+
+    def get_camera_center(self):
+        return self.canvas.get_camera_center()
+
+    def set_camera_center(self, center: Coordinates):
+        self.canvas.set_camera_center(center)
+
+
+def instrument(timer: PhaseTimer,
+               game_state: SnakeGameState,
+               visualizer: Optional[Visualizer] = None,
+               input_source: Optional[InputSource] = None) -> Optional[InputSource]:
+    """
+    Wraps the game elements, the visualizable objects and the canvas in place with timing proxies.
+    Nothing is wrapped without instrumentation, so it costs nothing when it is not used.
+    :return: the timed input source, if an input source is given
+    """
+    game_state.game_elements = [
+        TimedGameElement(element, timer, f"{type(element).__name__}#{index}")
+        for index, element in enumerate(game_state.game_elements)
+    ]
+    if visualizer is not None:
+        visualizer.visualizable_objects = [
+            TimedVisualizable(obj, timer, f"{type(obj).__name__}#{index}")
+            for index, obj in enumerate(visualizer.visualizable_objects)
+        ]
+        visualizer.canvas = TimedCanvas(visualizer.canvas, timer)
+    if input_source is None:
+        return None
+    return TimedInputSource(input_source, timer)
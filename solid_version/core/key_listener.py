@@ -1,11 +1,24 @@
+import curses
+import os
+import select
+import sys
 import threading
+import time
+from collections import deque, namedtuple
+from typing import List
 
+from bosch_ASDIIE.solid_version.core.input_source import InputSource
 from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
 
+TimedKeyEvent = namedtuple("TimedKeyEvent", ("key_event", "timestamp"))
 
-class KeyboardListener:
+
+class KeyboardListener(InputSource):
     """
-    Keyboard listener class for the keyboard events, usable in remote environments, in a side-thread
+    Keyboard listener class for the keyboard events, usable in remote environments, in a side-thread.
+    The key events are kept in order in a short bounded queue, with their time.monotonic timestamps.
+    The game reads one key event per tick, so a repeated key (e.g. the auto-repeat of a held arrow) is queued only
+    once, and the queue holds a few turns only, otherwise the snake would lag many ticks behind the keyboard.
     """
     KEYPRESS_TO_KEY_EVENT = {
         "KEY_UP": KeyEvent.UP,
@@ -13,46 +26,104 @@ class KeyboardListener:
         "KEY_LEFT": KeyEvent.LEFT,
         "KEY_RIGHT": KeyEvent.RIGHT,
     }
-    MILLISECONDS = 1000
+    QUEUE_SIZE = 3
+    # where select cannot wait for the terminal (Windows), getkey waits this long for a key instead
+    POLL_TIMEOUT_MS = 50
 
-    def __init__(self):
+    def __init__(self, queue_size: int = QUEUE_SIZE):
         self.screen = None
-        self.last_key = None
         self.thread = None
         self.stopped = False
+        # when the queue is full, the oldest key event is dropped
+        self.key_events = deque(maxlen=queue_size)
+        self.dropped = 0
+        self.error = None
+        self._lock = threading.Lock()
+        self._input_fd = None
+        self._wakeup_read = None
+        self._wakeup_write = None
 
     def listen(self):
         self.screen.keypad(True)
-        self.screen.timeout(self.MILLISECONDS)
-
-        while not self.stopped:
-            try:
-                key = self.screen.getkey()
-                if key in self.KEYPRESS_TO_KEY_EVENT:
-                    self.last_key = key
-            except:
-                pass
+        if self._wakeup_read is None:
+            self.screen.timeout(self.POLL_TIMEOUT_MS)
+        else:
+            self.screen.nodelay(True)
+        try:
+            while not self.stopped:
+                if self._wakeup_read is not None:
+                    # waiting for input or for the wakeup of stop()
+                    readable, _, _ = select.select([self._input_fd, self._wakeup_read], [], [])
+                    if self._wakeup_read in readable:
+                        break
+                self._read_keys()
+        except Exception as error:
+            self.error = error
 
     def stop(self):
         self.stopped = True
+        if self._wakeup_write is not None:
+            os.write(self._wakeup_write, b"\0")
         self.thread.join()
+        if self._wakeup_write is not None:
+            os.close(self._wakeup_read)
+            os.close(self._wakeup_write)
+            self._wakeup_read = self._wakeup_write = None
 
         self.screen.timeout(-1)
         self.screen = None
 
-    def start(self, screen):
+    def start(self, screen, input_fd: int = None):
         self.screen = screen
+        self._input_fd = sys.stdin.fileno() if input_fd is None else input_fd
+        # select only accepts sockets on Windows, the listener polls with a getkey timeout there
+        if os.name == "posix":
+            self._wakeup_read, self._wakeup_write = os.pipe()
         self.thread = threading.Thread(target=self.listen, daemon=True)
         self.stopped = False
         self.thread.start()
 
     def has_happened(self):
-        return self.last_key is not None
+        self._raise_error()
+        return len(self.key_events) > 0
 
     def read_last_key_event(self) -> KeyEvent:
-        if self.last_key is None:
-            raise ValueError("KeyBoardListener has not noticed "
-                             "any key event that could be read.")
-        key_event = self.KEYPRESS_TO_KEY_EVENT[self.last_key]
-        self.last_key = None
-        return key_event
+        """
+        :return: the oldest key event of the queue, removing it
+        """
+        self._raise_error()
+        with self._lock:
+            if not self.key_events:
+                raise ValueError("KeyBoardListener has not noticed "
+                                 "any key event that could be read.")
+            return self.key_events.popleft().key_event
+
+    def drain(self) -> List[TimedKeyEvent]:
+        """
+        :return: every queued key event in order, emptying the queue
+        """
+        self._raise_error()
+        with self._lock:
+            key_events = list(self.key_events)
+            self.key_events.clear()
+        return key_events
+
+    def _read_keys(self):
+        # reading every key which is already available, without blocking
+        while True:
+            try:
+                key = self.screen.getkey()
+            except curses.error:
+                return
+            if key in self.KEYPRESS_TO_KEY_EVENT:
+                key_event = TimedKeyEvent(self.KEYPRESS_TO_KEY_EVENT[key], time.monotonic())
+                with self._lock:
+                    if self.key_events and self.key_events[-1].key_event == key_event.key_event:
+                        continue
+                    if len(self.key_events) == self.key_events.maxlen:
+                        self.dropped += 1
+                    self.key_events.append(key_event)
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError("KeyboardListener stopped with an error.") from self.error
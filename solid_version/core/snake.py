@@ -12,25 +12,33 @@ class MovingTransformation:
     """
     A class for handling keyboard events during playing
     """
+    # row and column change of one move in each direction
+    DIRECTION_DELTAS = {
+        KeyEvent.UP: (-1, 0),
+        KeyEvent.LEFT: (0, -1),
+        KeyEvent.DOWN: (1, 0),
+        KeyEvent.RIGHT: (0, 1),
+    }
+
     def __init__(self, direction: KeyEvent, map_size: MapSize):
-        self.direction = direction
         self.map_size = map_size
+        self.direction = direction
+
+    @property
+    def direction(self) -> KeyEvent:
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction: KeyEvent):
+        self._direction = direction
+        self._delta = self.DIRECTION_DELTAS.get(direction)
 
     def __call__(self, coordinates: Coordinates) -> Coordinates:
-        if self.direction == KeyEvent.UP:
-            new_row = (coordinates.row - 1) % self.map_size.row_num
-            return Coordinates(new_row, coordinates.col)
-        elif self.direction == KeyEvent.LEFT:
-            new_col = (coordinates.col - 1) % self.map_size.col_num
-            return Coordinates(coordinates.row, new_col)
-        elif self.direction == KeyEvent.DOWN:
-            new_row = (coordinates.row + 1) % self.map_size.row_num
-            return Coordinates(new_row, coordinates.col)
-        elif self.direction == KeyEvent.RIGHT:
-            new_col = (coordinates.col + 1) % self.map_size.col_num
-            return Coordinates(coordinates.row, new_col)
-        else:
+        if self._delta is None:
             raise ValueError(f"There is no moving forward {self.direction} direction.")
+        delta_row, delta_col = self._delta
+        return Coordinates((coordinates.row + delta_row) % self.map_size.row_num,
+                           (coordinates.col + delta_col) % self.map_size.col_num)
 
 
 class Snake(GameElement, Visualizable):
@@ -49,6 +57,8 @@ class Snake(GameElement, Visualizable):
             ])
         else:
             self.body_parts = body
+        # the cells of the body, for collision checks without scanning the body
+        self.occupied = set(self.body_parts)
         if map_size is None:
             map_size = MapSize(10, 10)
         self.moving_transformation = MovingTransformation(starting_direction, map_size)
@@ -58,15 +68,17 @@ class Snake(GameElement, Visualizable):
             self.moving_transformation.direction = key_event
 
     def tick(self):
-        self.body_parts.popleft()
+        self.occupied.discard(self.body_parts.popleft())
         new_head = self.moving_transformation(self.body_parts[-1])
-        if new_head in self.body_parts:
+        if new_head in self.occupied:
             return False
         self.body_parts.append(new_head)
+        self.occupied.add(new_head)
         return True
 
     def draw(self, canvas: Canvas):
-        canvas.draw_dots(self.body_parts)
+        viewport = canvas.get_viewport()
+        canvas.draw_dots(self.body_parts if viewport is None else viewport.clip(self.body_parts))
 
     def _is_not_opposite_direction(self, key_event):
         if self.moving_transformation.direction == KeyEvent.LEFT and \
@@ -0,0 +1,132 @@
+import random
+from collections import deque
+from typing import Dict, List
+
+from bosch_ASDIIE.solid_version.core.canvas import Canvas
+from bosch_ASDIIE.solid_version.core.game_element import GameElement
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+from bosch_ASDIIE.solid_version.core.snake import Snake
+from bosch_ASDIIE.solid_version.core.visualizable import Visualizable
+
+
+class SnakeArena(GameElement, Visualizable):
+    """
+    A game element hosting many snakes on one map. Every snake moves at the same time, and the collisions
+    are resolved in one pass with a shared occupancy map (cell -> snake index) instead of pairwise checks.
+    A snake dies when its head hits any body or another head, and its body disappears from the map.
+    """
+    def __init__(self,
+                 snakes: List[Snake],
+                 player_index: int = 0,
+                 wander_probability: float = 0.0,
+                 seed: int = None):
+        self.snakes = snakes
+        # the snake controlled by take_action, None if there is no player
+        self.player_index = player_index
+        # probability of the other snakes turning randomly in a tick
+        self.wander_probability = wander_probability
+        self.random = random.Random(seed)
+        self.alive = [True] * len(snakes)
+        self.alive_indices = list(range(len(snakes)))
+        self.occupancy: Dict[Coordinates, int] = {}
+        for index, snake in enumerate(snakes):
+            for part in snake.body_parts:
+                if part in self.occupancy:
+                    raise ValueError(f"Snakes {self.occupancy[part]} and {index} overlap at {part}.")
+                self.occupancy[part] = index
+
+    @classmethod
+    def with_random_snakes(cls,
+                           num_snakes: int,
+                           map_size: MapSize,
+                           length: int = 5,
+                           seed: int = None,
+                           **kwargs):
+        """
+        Creates an arena with non-overlapping horizontal snakes at random positions.
+        Every row is cut into slots of the snake length from a random offset, and the snakes
+        get distinct random slots, so the placement always ends.
+        """
+        slots_per_row = map_size.col_num // length
+        capacity = map_size.row_num * slots_per_row
+        if num_snakes > capacity:
+            raise ValueError(f"{num_snakes} snakes of length {length} cannot be placed "
+                             f"on a {map_size.row_num}x{map_size.col_num} map.")
+        rand = random.Random(seed)
+        row_offsets = [rand.randrange(map_size.col_num) for _ in range(map_size.row_num)]
+        snakes = []
+        for slot in rand.sample(range(capacity), num_snakes):
+            row, slot_in_row = divmod(slot, slots_per_row)
+            col = row_offsets[row] + slot_in_row * length
+            body = deque(Coordinates(row, (col + i) % map_size.col_num) for i in range(length))
+            snakes.append(Snake(body, KeyEvent.RIGHT, map_size))
+        return cls(snakes, seed=seed, **kwargs)
+
+    def take_action(self, key_event: KeyEvent):
+        if self.player_index is not None and self.alive[self.player_index]:
+            self.snakes[self.player_index].take_action(key_event)
+
+    def take_actions(self, key_events: Dict[int, KeyEvent]):
+        """
+        Passes key events to any of the snakes
+        :param key_events: key event of each snake index
+        """
+        for index, key_event in key_events.items():
+            self.snakes[index].take_action(key_event)
+
+    def tick(self) -> bool:
+        if self.wander_probability > 0:
+            self._wander()
+
+        # every tail leaves its cell before the heads move
+        moves = []
+        head_counts: Dict[Coordinates, int] = {}
+        for index in self.alive_indices:
+            snake = self.snakes[index]
+            tail = snake.body_parts.popleft()
+            snake.occupied.discard(tail)
+            del self.occupancy[tail]
+            new_head = snake.moving_transformation(snake.body_parts[-1])
+            moves.append((index, new_head))
+            head_counts[new_head] = head_counts.get(new_head, 0) + 1
+
+        # head-to-head and head-to-body collisions, checked before any snake is removed
+        survivors = []
+        dead = []
+        for index, new_head in moves:
+            if head_counts[new_head] > 1 or new_head in self.occupancy:
+                dead.append(index)
+            else:
+                survivors.append((index, new_head))
+
+        for index, new_head in survivors:
+            snake = self.snakes[index]
+            snake.body_parts.append(new_head)
+            snake.occupied.add(new_head)
+            self.occupancy[new_head] = index
+        for index in dead:
+            self.alive[index] = False
+            for part in self.snakes[index].body_parts:
+                del self.occupancy[part]
+        self.alive_indices = [index for index, _ in survivors]
+
+        if self.player_index is None:
+            return len(self.alive_indices) > 0
+        return self.alive[self.player_index]
+
+    def draw(self, canvas: Canvas):
+        viewport = canvas.get_viewport()
+        if viewport is not None and viewport.area < len(self.occupancy):
+            # looking up the visible cells is cheaper than clipping every body
+            canvas.draw_dots([cell for cell in viewport.cells() if cell in self.occupancy])
+            return
+        for index in self.alive_indices:
+            body_parts = self.snakes[index].body_parts
+            canvas.draw_dots(body_parts if viewport is None else viewport.clip(body_parts))
+
+    def _wander(self):
+        key_events = list(KeyEvent)
+        for index in self.alive_indices:
+            if index != self.player_index and self.random.random() < self.wander_probability:
+                self.snakes[index].take_action(self.random.choice(key_events))
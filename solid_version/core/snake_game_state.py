@@ -11,10 +11,14 @@ class SnakeGameState:
     def __init__(self, game_elements: List[GameElement]):
         self.game_elements = game_elements
         self._can_game_continue = True
+        # the game element which stopped the game
+        self.terminated_by = None
 
     def step(self):
         for game_element in self.game_elements:
             self._can_game_continue = self._can_game_continue and game_element.tick()
+            if not self._can_game_continue and self.terminated_by is None:
+                self.terminated_by = game_element
 
     def is_terminated(self):
         return not self._can_game_continue
@@ -0,0 +1,83 @@
+import time
+from typing import Callable
+
+
+class TickStatistics:
+    """
+    Overrun statistics of the ticks, an overrun is the time a tick finished after its deadline
+    """
+    def __init__(self):
+        self.ticks = 0
+        self.overrun_ticks = 0
+        self.total_overrun = 0.0
+        self.max_overrun = 0.0
+        self.skipped_renders = 0
+        self.resyncs = 0
+
+    def add_tick(self, overrun: float):
+        self.ticks += 1
+        if overrun > 0:
+            self.overrun_ticks += 1
+            self.total_overrun += overrun
+            self.max_overrun = max(self.max_overrun, overrun)
+
+    @property
+    def mean_overrun(self):
+        if self.overrun_ticks == 0:
+            return 0.0
+        return self.total_overrun / self.overrun_ticks
+
+
+class TickScheduler:
+    """
+    Fixed-timestep scheduler for the game loop, the ticks follow time.monotonic deadlines.
+    When the loop falls behind, the following ticks run without sleeping until it catches up,
+    and the renders are skipped in the meantime instead of the ticks.
+    """
+    def __init__(self,
+                 tick_period: float,
+                 max_skipped_renders: int = 10,
+                 max_lag_ticks: int = 25,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.tick_period = tick_period
+        # a frame is rendered at least after this many skipped ones, so the screen does not freeze
+        self.max_skipped_renders = max_skipped_renders
+        # when the loop is behind by more ticks than this (e.g. the process was suspended),
+        # the schedule restarts from the current time instead of catching up
+        self.max_lag_ticks = max_lag_ticks
+        self.clock = clock
+        self.sleep = sleep
+        self.statistics = TickStatistics()
+        self._deadline = None
+        self._skipped_in_row = 0
+
+    def start(self):
+        self._deadline = self.clock() + self.tick_period
+
+    def should_render(self) -> bool:
+        if self._deadline is None:
+            raise ValueError("The TickScheduler has not been started.")
+        if self.clock() < self._deadline or self._skipped_in_row >= self.max_skipped_renders:
+            self._skipped_in_row = 0
+            return True
+        self._skipped_in_row += 1
+        self.statistics.skipped_renders += 1
+        return False
+
+    def wait_next_tick(self):
+        """
+        Sleeps until the deadline of the current tick, then moves the deadline one period forward
+        """
+        if self._deadline is None:
+            raise ValueError("The TickScheduler has not been started.")
+        now = self.clock()
+        overrun = now - self._deadline
+        self.statistics.add_tick(overrun)
+        if overrun < 0:
+            self.sleep(-overrun)
+        if overrun > self.max_lag_ticks * self.tick_period:
+            self.statistics.resyncs += 1
+            self._deadline = now + self.tick_period
+        else:
+            self._deadline += self.tick_period
@@ -0,0 +1,51 @@
+from typing import Iterable, Iterator, List, Optional
+
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+
+
+class Viewport:
+    """
+    The visible window of the wrapping map, starting from its top-left corner (origin).
+    It is never larger than the map, and it can wrap around the edges of the map.
+    """
+    def __init__(self, origin: Coordinates, size: MapSize, map_size: MapSize):
+        self.map_size = map_size
+        self.size = MapSize(min(size.row_num, map_size.row_num), min(size.col_num, map_size.col_num))
+        self.origin = Coordinates(origin.row % map_size.row_num, origin.col % map_size.col_num)
+
+    @classmethod
+    def centered_on(cls, center: Coordinates, size: MapSize, map_size: MapSize):
+        """
+        Creates a viewport with the center in its middle, a dimension covering the whole map does not move
+        """
+        row = 0 if size.row_num >= map_size.row_num else center.row - size.row_num // 2
+        col = 0 if size.col_num >= map_size.col_num else center.col - size.col_num // 2
+        return cls(Coordinates(row, col), size, map_size)
+
+    @property
+    def area(self) -> int:
+        return self.size.row_num * self.size.col_num
+
+    def to_screen(self, coordinates: Coordinates) -> Optional[Coordinates]:
+        """
+        :return: the position of the map coordinates in the viewport, None if they are not visible
+        """
+        row = (coordinates.row - self.origin.row) % self.map_size.row_num
+        col = (coordinates.col - self.origin.col) % self.map_size.col_num
+        if row >= self.size.row_num or col >= self.size.col_num:
+            return None
+        return Coordinates(row, col)
+
+    def clip(self, coordinates: Iterable[Coordinates]) -> List[Coordinates]:
+        """
+        :return: the visible ones of the map coordinates
+        """
+        return [dot for dot in coordinates if self.to_screen(dot) is not None]
+
+    def cells(self) -> Iterator[Coordinates]:
+        """
+        :return: the map coordinates of every visible cell
+        """
+        for row in range(self.origin.row, self.origin.row + self.size.row_num):
+            for col in range(self.origin.col, self.origin.col + self.size.col_num):
+                yield Coordinates(row % self.map_size.row_num, col % self.map_size.col_num)
@@ -1,50 +1,94 @@
-import os
-from typing import List
+from typing import Callable, Dict, List
 
 from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
 from bosch_ASDIIE.solid_version.core.canvas import Canvas
 from bosch_ASDIIE.solid_version.core.screen import Screen
+from bosch_ASDIIE.solid_version.core.viewport import Viewport
 
 
 class ConsoleCanvas(Canvas):
     """
-    The canvas class for the console version
+    The canvas class for the console version, double-buffered: the drawn frame is compared
+    to the previous one and only the changed cells are written to the screen.
+    Only the part of the map fitting in the terminal is shown, following the camera target if there is one,
+    so the cost of a frame depends on the size of the terminal, not on the size of the map.
     """
+    DOT = "x"
+    EMPTY = " "
 
     def __init__(self,
                  map_size: MapSize,
-                 curses_screen: Screen):
+                 curses_screen: Screen,
+                 camera_target: Callable[[], Coordinates] = None):
 
-        self.width = map_size.col_num + 1
-        self.height = map_size.col_num + 1
+        self.map_size = map_size
+        self.width = map_size.col_num
+        self.height = map_size.row_num
         self.crs_screen = curses_screen
-        self.map = self._get_empty_map()
+        # the viewport is centered on these coordinates in every frame, e.g. on the head of the snake
+        self.camera_target = camera_target
+        # the center of the next frame set with set_camera_center, used once instead of the camera target
+        self._camera_center = None
+        self.viewport = self._create_viewport()
+        # the frame on the screen and the frame being drawn, in screen coordinates
+        self._front: Dict[Coordinates, str] = {}
+        self._back: Dict[Coordinates, str] = {}
+        self._full_redraw = True
 
     def clear(self):
-        command = 'clear'
-        if os.name in ('nt', 'dos'):  # If Machine is running on Windows, use cls
-            command = 'cls'
-        os.system(command)
-        self.map = self._get_empty_map()
-        self.crs_screen.clear()
+        self._back = {}
+        viewport = self._create_viewport()
+        if viewport.size != self.viewport.size:
+            # the terminal was resized
+            self._full_redraw = True
+        self.viewport = viewport
 
     def draw_dots(self, coordinates: List[Coordinates]):
         for dot in coordinates:
-            self.map[dot.row][dot.col] = "x"
+            screen_dot = self.viewport.to_screen(dot)
+            if screen_dot is not None:
+                self._back[screen_dot] = self.DOT
 
     def render(self):
-        for num_row, row in enumerate(self.map):
-            self.crs_screen.addstr(num_row, 0, "".join(row) + "\n")
+        if self._full_redraw:
+            # wipe what was on the terminal before the first frame
+            self.crs_screen.clear()
+            self._front = {}
+            self._full_redraw = False
+        for dot in self._front:
+            if dot not in self._back:
+                self.crs_screen.addstr(dot.row, dot.col, self.EMPTY)
+        for dot, char in self._back.items():
+            if self._front.get(dot) != char:
+                self.crs_screen.addstr(dot.row, dot.col, char)
         self.crs_screen.refresh()
-
-    def _get_empty_map(self):
-        screen = []
-        for _ in range(self.height):
-            screen.append([" "] * self.width)
-        return screen
+        self._front = self._back
+        self._back = {}
 
     def get_height(self):
         return self.height
 
     def get_width(self):
         return self.width
+
+    def get_viewport(self) -> Viewport:
+        return self.viewport
+
+    def get_camera_center(self) -> Coordinates:
+        if self.camera_target is None:
+            return None
+        return self.camera_target()
+
+    def set_camera_center(self, center: Coordinates):
+        self._camera_center = center
+
+    def _create_viewport(self) -> Viewport:
+        rows, cols = self.crs_screen.getmaxyx()
+        # the last column is left empty, curses cannot write the bottom-right corner
+        size = MapSize(max(rows, 1), max(cols - 1, 1))
+        center, self._camera_center = self._camera_center, None
+        if center is None:
+            center = self.get_camera_center()
+        if center is None:
+            return Viewport(Coordinates(0, 0), size, self.map_size)
+        return Viewport.centered_on(center, size, self.map_size)
@@ -0,0 +1,29 @@
+from typing import List
+
+from bosch_ASDIIE.solid_version.core.canvas import Canvas
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+
+
+class NullCanvas(Canvas):
+    """
+    Canvas drawing nothing, for running the game without a terminal
+    """
+
+    def __init__(self, map_size: MapSize):
+        self.width = map_size.col_num
+        self.height = map_size.row_num
+
+    def draw_dots(self, coordinates: List[Coordinates]):
+        pass
+
+    def render(self):
+        pass
+
+    def clear(self):
+        pass
+
+    def get_height(self):
+        return self.height
+
+    def get_width(self):
+        return self.width
@@ -0,0 +1,57 @@
+from itertools import chain
+from typing import List
+
+import numpy as np
+
+from bosch_ASDIIE.solid_version.core.canvas import Canvas
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+
+
+class NumpyCanvas(Canvas):
+    """
+    Canvas drawing into a preallocated uint8 array instead of a terminal, for tests and benchmarks.
+    The cells of the dots are DOT, the other ones are EMPTY.
+    """
+    EMPTY = 0
+    DOT = 1
+    # the characters of the cell values in the text form
+    CHARS = {EMPTY: " ", DOT: "x"}
+
+    def __init__(self, map_size: MapSize):
+        self.width = map_size.col_num
+        self.height = map_size.row_num
+        self.buffer = np.full((self.height, self.width), self.EMPTY, dtype=np.uint8)
+        self.rendered_frames = 0
+        self._text_table = bytes.maketrans(bytes(self.CHARS), "".join(self.CHARS.values()).encode())
+
+    def draw_dots(self, coordinates: List[Coordinates]):
+        count = len(coordinates)
+        if count == 0:
+            return
+        dots = np.fromiter(chain.from_iterable(coordinates), dtype=np.intp, count=2 * count)
+        self.buffer[dots[0::2], dots[1::2]] = self.DOT
+
+    def render(self):
+        self.rendered_frames += 1
+
+    def clear(self):
+        self.buffer.fill(self.EMPTY)
+
+    def get_height(self):
+        return self.height
+
+    def get_width(self):
+        return self.width
+
+    def to_array(self) -> np.ndarray:
+        """
+        :return: a copy of the drawn frame
+        """
+        return self.buffer.copy()
+
+    def to_text(self) -> str:
+        """
+        :return: the drawn frame with one line per row
+        """
+        text = self.buffer.tobytes().translate(self._text_table).decode()
+        return "\n".join(text[row * self.width:(row + 1) * self.width] for row in range(self.height))
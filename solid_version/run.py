@@ -1,12 +1,20 @@
 import curses
+import io
+import sys
 from argparse import ArgumentParser
 
+from bosch_ASDIIE.solid_version.core.async_visualizer import AsyncVisualizer
 from bosch_ASDIIE.solid_version.core.game import Game
+from bosch_ASDIIE.solid_version.core.headless_game import HeadlessGame
+from bosch_ASDIIE.solid_version.core.input_source import RandomInput
+from bosch_ASDIIE.solid_version.core.instrumentation import PhaseTimer
 from bosch_ASDIIE.solid_version.core.key_listener import KeyboardListener
+from bosch_ASDIIE.solid_version.core.snake_arena import SnakeArena
 from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
 from bosch_ASDIIE.solid_version.core.snake import Snake
 from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
 from bosch_ASDIIE.solid_version.gui.console_canvas import ConsoleCanvas
+from bosch_ASDIIE.solid_version.gui.null_canvas import NullCanvas
 from bosch_ASDIIE.solid_version.core.map import MapSize
 from bosch_ASDIIE.solid_version.core.screen import Screen
 
@@ -18,8 +26,35 @@ def main():
     # arg parser
     arg_parser = ArgumentParser()
     arg_parser.add_argument("--gui", type=str, default="console")
+    arg_parser.add_argument("--headless", action="store_true",
+                            help="run with random input, without terminal and sleeping")
+    arg_parser.add_argument("--ticks", type=int, default=None, help="tick limit of the headless run")
+    arg_parser.add_argument("--seed", type=int, default=None, help="seed of the random input")
+    arg_parser.add_argument("--snakes", type=int, default=1,
+                            help="number of snakes of the headless run, more than one starts an arena")
+    arg_parser.add_argument("--map-size", type=int, default=HEIGHT,
+                            help="map size, the console shows the part of a larger map around the snake")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="time the phases of the game loop, the percentiles are printed at exit and on SIGUSR1")
     args = arg_parser.parse_args()
 
+    phase_timer = PhaseTimer() if args.profile else None
+
+    if args.headless:
+        if phase_timer is not None:
+            phase_timer.install_signal_handler()
+        try:
+            run_headless(args.ticks, args.seed, args.snakes, MapSize(args.map_size, args.map_size), phase_timer)
+        finally:
+            if phase_timer is not None:
+                phase_timer.dump()
+        return
+
+    # curses owns the terminal during the game, the reports of the signals are printed after it
+    signal_reports = io.StringIO()
+    if phase_timer is not None:
+        phase_timer.install_signal_handler(stream=signal_reports)
+
     # using curses lib for proper keyboard-canvas interaction through SSH
     screen = Screen()
     curses.cbreak()
@@ -27,17 +62,45 @@ def main():
     key_listener = KeyboardListener()
     key_listener.start(screen)
 
-    snake = Snake(map_size=MapSize(HEIGHT, WIDTH))
-    visualizer = Visualizer([snake], ConsoleCanvas(MapSize(HEIGHT, WIDTH), screen))
+    map_size = MapSize(args.map_size, args.map_size)
+    snake = Snake(map_size=map_size)
+    canvas = ConsoleCanvas(map_size, screen, camera_target=lambda: snake.body_parts[-1])
+    # the screen is written in a side-thread, so slow terminals do not delay the ticks
+    visualizer = AsyncVisualizer([snake], canvas)
     start_game_state = SnakeGameState([snake])
-    game = Game(key_listener, start_game_state, visualizer)
-    game.run()
-
-    # stop the screen
-    curses.nocbreak()
-    screen.keypad(0)
-    curses.echo()
-    curses.endwin()
+    game = Game(key_listener, start_game_state, visualizer, phase_timer=phase_timer)
+    try:
+        try:
+            game.run()
+        finally:
+            # the visualizer re-raises the errors of its render thread, the listener is stopped anyway
+            try:
+                visualizer.stop()
+            finally:
+                key_listener.stop()
+    finally:
+        # stop the screen
+        curses.nocbreak()
+        screen.keypad(0)
+        curses.echo()
+        curses.endwin()
+
+        if phase_timer is not None:
+            sys.stderr.write(signal_reports.getvalue())
+            phase_timer.dump()
+
+
+def run_headless(max_ticks, seed, num_snakes, map_size, phase_timer=None):
+    if num_snakes > 1:
+        element = SnakeArena.with_random_snakes(num_snakes, map_size, seed=seed, wander_probability=0.05)
+    else:
+        element = Snake(map_size=map_size)
+    visualizer = Visualizer([element], NullCanvas(map_size))
+    game = HeadlessGame(RandomInput(seed=seed), SnakeGameState([element]), visualizer, max_ticks, phase_timer)
+    report = game.run()
+    print(f"{report.ticks} ticks in {report.seconds:.3f} s ({report.ticks_per_second:.0f} ticks/s), "
+          f"{report.termination_reason}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import threading
+
+from bosch_ASDIIE.solid_version.core.async_visualizer import AsyncVisualizer
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+from bosch_ASDIIE.solid_version.core.snake import Snake
+from bosch_ASDIIE.solid_version.gui.console_canvas import ConsoleCanvas
+from bosch_ASDIIE.solid_version.gui.null_canvas import NullCanvas
+
+
+class BlockingCanvas(NullCanvas):
+    def __init__(self):
+        super().__init__(MapSize(10, 10))
+        self.rendered = []
+        self.dots = []
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def draw_dots(self, coordinates):
+        self.dots.extend(coordinates)
+
+    def render(self):
+        self.unblocked.wait()
+        self.rendered.append(self.dots)
+
+    def clear(self):
+        self.dots = []
+
+
+def testAsyncVisualizer_whenSnakeMovesAfterRender_thenSnapshotIsDrawn():
+    snake = Snake()
+    canvas = BlockingCanvas()
+    visualizer = AsyncVisualizer([snake], canvas)
+    expected = list(snake.body_parts)
+    canvas.unblocked.clear()
+    visualizer.render()
+    snake.tick()
+    canvas.unblocked.set()
+    visualizer.stop()
+    assert canvas.rendered == [expected], \
+        "The canvas should get the body of the tick boundary, not the body of the next tick."
+
+
+def testAsyncVisualizer_whenRenderingLags_thenFramesAreDropped():
+    snake = Snake()
+    canvas = BlockingCanvas()
+    visualizer = AsyncVisualizer([snake], canvas)
+    canvas.unblocked.clear()
+    visualizer.render()
+    for _ in range(10):
+        snake.tick()
+        visualizer.render()
+    last = list(snake.body_parts)
+    canvas.unblocked.set()
+    visualizer.stop()
+    assert visualizer.rendered_frames + visualizer.dropped_frames == 11
+    assert visualizer.dropped_frames >= 9 and len(canvas.rendered) <= 2, \
+        "The frames drawn while the canvas is blocked should be dropped, not queued."
+    assert canvas.rendered[-1] == last, "The latest frame should always be drawn."
+
+
+class BlockingScreen:
+    def __init__(self):
+        self.dots = set()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def getmaxyx(self):
+        return 5, 6
+
+    def addstr(self, row, col, text):
+        if text == "x":
+            self.dots.add(Coordinates(row, col))
+        else:
+            self.dots.discard(Coordinates(row, col))
+
+    def clear(self):
+        self.dots = set()
+
+    def refresh(self):
+        self.unblocked.wait()
+
+
+def testAsyncVisualizer_whenRenderingLags_thenCameraFollowsTheSnapshot():
+    snake = Snake(starting_direction=KeyEvent.RIGHT, map_size=MapSize(100, 100))
+    screen = BlockingScreen()
+    canvas = ConsoleCanvas(MapSize(100, 100), screen, camera_target=lambda: snake.body_parts[-1])
+    visualizer = AsyncVisualizer([snake], canvas)
+    screen.unblocked.clear()
+    visualizer.render()
+    snake.tick()
+    visualizer.render()
+    for _ in range(3):
+        snake.tick()
+    screen.unblocked.set()
+    visualizer.stop()
+    assert screen.dots == {Coordinates(2, col) for col in range(3)}, \
+        "The frame should be centered on the head of its own tick, not on the head of the game state."
@@ -0,0 +1,72 @@
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+from bosch_ASDIIE.solid_version.core.viewport import Viewport
+from bosch_ASDIIE.solid_version.gui.console_canvas import ConsoleCanvas
+
+
+class ScreenMock:
+    def __init__(self, rows=24, cols=80):
+        self.written = []
+        self.clear_count = 0
+        self.rows = rows
+        self.cols = cols
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def addstr(self, row, col, text):
+        self.written.append((row, col, text))
+
+    def clear(self):
+        self.clear_count += 1
+
+    def refresh(self):
+        pass
+
+
+def draw_frame(canvas, screen, dots):
+    screen.written = []
+    canvas.clear()
+    canvas.draw_dots(dots)
+    canvas.render()
+    return screen.written
+
+
+def testConsoleCanvas_whenSnakeMoves_thenOnlyChangedCellsAreWritten():
+    screen = ScreenMock()
+    canvas = ConsoleCanvas(MapSize(10, 10), screen)
+    draw_frame(canvas, screen, [Coordinates(0, 1), Coordinates(0, 2), Coordinates(0, 3)])
+    written = draw_frame(canvas, screen, [Coordinates(0, 2), Coordinates(0, 3), Coordinates(0, 4)])
+    assert sorted(written) == [(0, 1, " "), (0, 4, "x")], \
+        "Only the disappeared tail and the new head should be written to the screen."
+
+
+def testConsoleCanvas_whenNothingChanges_thenNothingIsWritten():
+    screen = ScreenMock()
+    canvas = ConsoleCanvas(MapSize(10, 10), screen)
+    dots = [Coordinates(1, 1), Coordinates(1, 2)]
+    draw_frame(canvas, screen, dots)
+    assert draw_frame(canvas, screen, dots) == [], \
+        "An unchanged frame should not write anything to the screen."
+    assert screen.clear_count == 1, \
+        "The screen should be cleared only before the first frame."
+
+
+def testConsoleCanvas_whenMapIsNotSquare_thenSizeFollowsRowsAndColumns():
+    canvas = ConsoleCanvas(MapSize(5, 30), ScreenMock())
+    assert (canvas.get_height(), canvas.get_width()) == (5, 30)
+
+
+def testConsoleCanvas_whenMapIsLargerThanTerminal_thenCameraFollowsTheTarget():
+    screen = ScreenMock(rows=10, cols=21)
+    head = Coordinates(500, 999)
+    canvas = ConsoleCanvas(MapSize(1000, 1000), screen, camera_target=lambda: head)
+    written = draw_frame(canvas, screen, [Coordinates(500, 998), head, Coordinates(0, 0)])
+    assert sorted(written) == [(5, 9, "x"), (5, 10, "x")], \
+        "The target should be in the middle of the screen and the dots outside of the viewport left out."
+
+
+def testViewport_whenCenteredAtTheEdge_thenWrapsAroundTheMap():
+    viewport = Viewport.centered_on(Coordinates(0, 0), MapSize(4, 4), MapSize(100, 100))
+    assert viewport.to_screen(Coordinates(98, 99)) == Coordinates(0, 1)
+    assert viewport.to_screen(Coordinates(50, 50)) is None
+    assert len(set(viewport.cells())) == viewport.area == 16
@@ -0,0 +1,36 @@
+from bosch_ASDIIE.solid_version.core.headless_game import HeadlessGame
+from bosch_ASDIIE.solid_version.core.input_source import RandomInput, ScriptedInput
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import MapSize
+from bosch_ASDIIE.solid_version.core.snake import Snake
+from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
+from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
+from bosch_ASDIIE.solid_version.gui.null_canvas import NullCanvas
+
+
+def testHeadlessGame_whenSnakeBitesItself_thenReportsTheTermination():
+    script = [KeyEvent.UP, KeyEvent.LEFT, KeyEvent.DOWN]
+    game = HeadlessGame(ScriptedInput(script), SnakeGameState([Snake()]), max_ticks=100)
+    report = game.run()
+    assert report.ticks == 3, \
+        "The game should stop in the tick when the snake bites itself."
+    assert report.termination_reason == "Snake terminated the game"
+
+
+def testHeadlessGame_whenTickLimitIsReached_thenStops():
+    snake = Snake()
+    visualizer = Visualizer([snake], NullCanvas(MapSize(10, 10)))
+    game = HeadlessGame(ScriptedInput([]), SnakeGameState([snake]), visualizer, max_ticks=1000)
+    report = game.run()
+    assert report.ticks == 1000 and report.termination_reason == "tick limit reached", \
+        "A snake moving in one direction should run until the tick limit."
+
+
+def testRandomInput_whenSeeded_thenReproducible():
+    first = RandomInput(seed=3)
+    second = RandomInput(seed=3)
+    for _ in range(100):
+        happened = first.has_happened()
+        assert happened == second.has_happened()
+        if happened:
+            assert first.read_last_key_event() == second.read_last_key_event()
@@ -0,0 +1,45 @@
+import signal
+
+from bosch_ASDIIE.solid_version.core.headless_game import HeadlessGame
+from bosch_ASDIIE.solid_version.core.input_source import ScriptedInput
+from bosch_ASDIIE.solid_version.core.instrumentation import PhaseTimer
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import MapSize
+from bosch_ASDIIE.solid_version.core.snake import Snake
+from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
+from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
+from bosch_ASDIIE.solid_version.gui.null_canvas import NullCanvas
+
+
+def testPhaseTimer_whenRingBufferIsFull_thenKeepsTheLastDurations():
+    timer = PhaseTimer(capacity=100)
+    for millis in range(1000):
+        timer.record("tick", millis / 1000)
+    summary = timer.summary()["tick"]
+    assert summary.count == 1000, "Every recorded duration should be counted."
+    assert summary.p50 == 0.95 and summary.max == 0.999, \
+        "The percentiles should only cover the last durations kept in the ring buffer."
+
+
+def testHeadlessGame_whenPhaseTimerIsGiven_thenTimesEveryPhase():
+    snake = Snake()
+    visualizer = Visualizer([snake], NullCanvas(MapSize(10, 10)))
+    timer = PhaseTimer()
+    game = HeadlessGame(ScriptedInput([KeyEvent.UP, KeyEvent.LEFT, KeyEvent.DOWN]),
+                        SnakeGameState([snake]), visualizer, max_ticks=100, phase_timer=timer)
+    report = game.run()
+    assert report.termination_reason == "Snake terminated the game", \
+        "The timing proxies should not change the outcome of the game."
+
+    summary = timer.summary()
+    assert {"input.poll", "input.read", "take_action:Snake#0", "tick:Snake#0",
+            "draw:Snake#0", "canvas.clear", "canvas.render"} <= set(summary), \
+        "Every phase of the game loop should be timed."
+    assert summary["tick:Snake#0"].count == report.ticks
+    assert "tick:Snake#0" in timer.report()
+
+
+def testPhaseTimer_whenPlatformHasNoSigusr1_thenHandlerIsNotInstalled(monkeypatch):
+    monkeypatch.delattr(signal, "SIGUSR1", raising=False)
+    assert not PhaseTimer().install_signal_handler(), \
+        "Without SIGUSR1 (e.g. on Windows) the handler should be skipped instead of failing."
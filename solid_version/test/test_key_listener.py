@@ -0,0 +1,94 @@
+import curses
+import os
+import time
+
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.key_listener import KeyboardListener
+
+
+class ScreenMock:
+    """
+    Screen returning the keys written to a pipe, like curses does with the terminal input
+    """
+    def __init__(self, input_fd):
+        self.input_fd = input_fd
+
+    def keypad(self, flag):
+        pass
+
+    def nodelay(self, flag):
+        pass
+
+    def timeout(self, milliseconds):
+        pass
+
+    def getkey(self):
+        try:
+            key = os.read(self.input_fd, 1)
+        except BlockingIOError:
+            raise curses.error("no input")
+        return {b"u": "KEY_UP", b"l": "KEY_LEFT", b"d": "KEY_DOWN"}.get(key, "q")
+
+
+def start_listener(queue_size=KeyboardListener.QUEUE_SIZE):
+    input_read, input_write = os.pipe()
+    os.set_blocking(input_read, False)
+    listener = KeyboardListener(queue_size)
+    listener.start(ScreenMock(input_read), input_fd=input_read)
+    return listener, input_write
+
+
+def wait_for_keys(listener, count):
+    deadline = time.monotonic() + 2
+    while len(listener.key_events) + listener.dropped < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def testKeyboardListener_whenKeysArriveInOneTick_thenAllAreKeptInOrder():
+    listener, input_write = start_listener()
+    os.write(input_write, b"uxld")
+    wait_for_keys(listener, 3)
+    key_events = listener.drain()
+    listener.stop()
+    assert [event.key_event for event in key_events] == [KeyEvent.UP, KeyEvent.LEFT, KeyEvent.DOWN], \
+        "Every key event should be kept in the order of arrival."
+    assert key_events[0].timestamp <= key_events[-1].timestamp
+    assert not listener.has_happened()
+
+
+def testKeyboardListener_whenQueueIsFull_thenOldestIsDropped():
+    listener, input_write = start_listener(queue_size=2)
+    os.write(input_write, b"uld")
+    wait_for_keys(listener, 3)
+    listener.stop()
+    assert listener.read_last_key_event() == KeyEvent.LEFT
+    assert listener.read_last_key_event() == KeyEvent.DOWN
+    assert listener.dropped == 1
+
+
+def testKeyboardListener_whenStopped_thenReturnsPromptly():
+    listener, _ = start_listener()
+    start = time.monotonic()
+    listener.stop()
+    assert time.monotonic() - start < 0.1, \
+        "Stopping should not wait for a key press or a timeout."
+
+
+def testKeyboardListener_whenKeyIsHeld_thenItIsQueuedOnce():
+    listener, input_write = start_listener()
+    os.write(input_write, b"uuuuuuuul")
+    wait_for_keys(listener, 2)
+    listener.stop()
+    assert [event.key_event for event in listener.drain()] == [KeyEvent.UP, KeyEvent.LEFT], \
+        "The auto-repeat of a held key should not pile up stale turns."
+
+
+def testKeyboardListener_whenSelectIsNotUsable_thenPollsWithTimeout(monkeypatch):
+    monkeypatch.setattr(os, "name", "nt")
+    listener, input_write = start_listener()
+    os.write(input_write, b"ul")
+    wait_for_keys(listener, 2)
+    start = time.monotonic()
+    listener.stop()
+    assert [event.key_event for event in listener.drain()] == [KeyEvent.UP, KeyEvent.LEFT]
+    assert time.monotonic() - start < 0.5, "Stopping should take at most one poll timeout."
@@ -0,0 +1,83 @@
+from collections import deque
+
+from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
+from bosch_ASDIIE.solid_version.core.snake import Snake
+from bosch_ASDIIE.solid_version.core.snake_arena import SnakeArena
+from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
+from bosch_ASDIIE.solid_version.core.viewport import Viewport
+from bosch_ASDIIE.solid_version.gui.null_canvas import NullCanvas
+
+
+def horizontal_snake(row, cols, direction):
+    return Snake(deque(Coordinates(row, col) for col in cols), direction, MapSize(10, 10))
+
+
+def testSnakeArena_whenHeadsMeet_thenBothSnakesDie():
+    left = horizontal_snake(0, [0, 1, 2], KeyEvent.RIGHT)
+    right = horizontal_snake(0, [6, 5, 4], KeyEvent.LEFT)
+    other = horizontal_snake(5, [0, 1, 2], KeyEvent.RIGHT)
+    arena = SnakeArena([left, right, other], player_index=2)
+    assert arena.tick(), \
+        "The player snake does not collide, so the game should continue."
+    assert arena.alive == [False, False, True], \
+        "Snakes moving their heads into the same cell should both die."
+    assert set(arena.occupancy) == set(other.body_parts), \
+        "The bodies of the dead snakes should be removed from the map."
+
+
+def testSnakeArena_whenHeadHitsAnotherBody_thenOnlyThatSnakeDies():
+    player = horizontal_snake(1, [2, 3, 4], KeyEvent.RIGHT)
+    player.take_action(KeyEvent.UP)
+    wall = horizontal_snake(0, [3, 4, 5, 6], KeyEvent.RIGHT)
+    arena = SnakeArena([player, wall])
+    snake_game_state = SnakeGameState([arena])
+    snake_game_state.step()
+    assert snake_game_state.is_terminated() and not arena.alive[0], \
+        "The player snake running into another body should die."
+    assert arena.alive[1]
+
+
+def testSnakeArena_whenManySnakesMove_thenOccupancyMatchesTheBodies():
+    arena = SnakeArena.with_random_snakes(200, MapSize(200, 200), seed=1, player_index=None,
+                                          wander_probability=0.3)
+    for _ in range(50):
+        arena.tick()
+    cells = [part for index in arena.alive_indices for part in arena.snakes[index].body_parts]
+    assert len(cells) == len(arena.occupancy) and set(cells) == set(arena.occupancy), \
+        "The shared occupancy map should contain exactly the cells of the living snakes."
+
+
+class ViewportCanvas(NullCanvas):
+    def __init__(self, map_size, viewport):
+        super().__init__(map_size)
+        self.viewport = viewport
+        self.dots = []
+
+    def draw_dots(self, coordinates):
+        self.dots.extend(coordinates)
+
+    def get_viewport(self):
+        return self.viewport
+
+
+def testSnakeArena_whenViewportIsSmall_thenOnlyVisibleCellsAreDrawn():
+    map_size = MapSize(100, 100)
+    arena = SnakeArena.with_random_snakes(200, map_size, seed=5)
+    viewport = Viewport(Coordinates(95, 95), MapSize(8, 8), map_size)
+    canvas = ViewportCanvas(map_size, viewport)
+    arena.draw(canvas)
+    expected = {cell for cell in arena.occupancy if viewport.to_screen(cell) is not None}
+    assert sorted(canvas.dots) == sorted(expected), \
+        "The arena should draw exactly the occupied cells of the viewport."
+
+
+def testSnakeArena_whenSnakesDoNotFit_thenRaisesInsteadOfLooping():
+    arena = SnakeArena.with_random_snakes(9, MapSize(3, 12), length=4, seed=1)
+    assert len(arena.occupancy) == 36, "A full map should still be filled without overlaps."
+    try:
+        SnakeArena.with_random_snakes(10, MapSize(3, 12), length=4)
+    except ValueError:
+        pass
+    else:
+        assert False, "Placing more snakes than the map can hold should raise a ValueError."
@@ -1,5 +1,8 @@
+from collections import deque
+
 from bosch_ASDIIE.solid_version.core.game_element import GameElement
 from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
+from bosch_ASDIIE.solid_version.core.map import Coordinates
 from bosch_ASDIIE.solid_version.core.snake_game_state import SnakeGameState
 from bosch_ASDIIE.solid_version.core.snake import Snake
 
@@ -66,3 +69,17 @@ def testSnakeGameState_whenSnakeMovesOneDirectionAfterInit_thenGameStateIsNotTer
     assert not snake_game_state.is_terminated(), \
         "When snake moves in one direction and it is short, " \
         "then it does not die."
+
+
+def testSnakeGameState_whenSnakeFollowsItsTail_thenGameStateIsNotTerminated():
+    snake = Snake(
+        deque([Coordinates(1, 0), Coordinates(0, 0), Coordinates(0, 1), Coordinates(1, 1)]),
+        starting_direction=KeyEvent.LEFT
+    )
+    snake_game_state = SnakeGameState([snake])
+    for key_event in [KeyEvent.LEFT, KeyEvent.UP, KeyEvent.RIGHT, KeyEvent.DOWN] * 10:
+        snake_game_state.take_action(key_event)
+        snake_game_state.step()
+    assert not snake_game_state.is_terminated(), \
+        "The cell left by the tail should be free for the head in the same step."
+    assert snake.occupied == set(snake.body_parts)
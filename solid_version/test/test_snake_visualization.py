@@ -5,7 +5,8 @@ from bosch_ASDIIE.solid_version.core.canvas import Canvas
 from bosch_ASDIIE.solid_version.core.key_event import KeyEvent
 from bosch_ASDIIE.solid_version.core.map import Coordinates, MapSize
 from bosch_ASDIIE.solid_version.core.snake import Snake
-from bosch_ASDIIE.solid_version.gui.console_canvas import ConsoleCanvas
+from bosch_ASDIIE.solid_version.core.visualizer import Visualizer
+from bosch_ASDIIE.solid_version.gui.numpy_canvas import NumpyCanvas
 
 
 class SpyCanvas(Canvas):
@@ -27,9 +28,15 @@ class SpyCanvas(Canvas):
     def render(self):
         pass
 
+    def get_height(self):
+        return self.canvas.get_height()
+
+    def get_width(self):
+        return self.canvas.get_width()
+
 
 def testCanvas_whenSnakeMoving_thenNewHeadAppearsAndTailDisappears():
-    canvas = ConsoleCanvas(10, 10)
+    canvas = NumpyCanvas(MapSize(10, 10))
     spy_canvas = SpyCanvas(canvas)
     snake = Snake(
         deque([Coordinates(0, 1), Coordinates(0, 2), Coordinates(0, 3)]),
@@ -50,7 +57,7 @@ def testCanvas_whenSnakeMoving_thenNewHeadAppearsAndTailDisappears():
 
 
 def testCanvas_whenSnakeMoving_thenOppositeKeyEventDoesNotDoAnything():
-    canvas = ConsoleCanvas(10, 10)
+    canvas = NumpyCanvas(MapSize(10, 10))
     spy_canvas = SpyCanvas(canvas)
     snake = Snake(
         deque([Coordinates(0, 1), Coordinates(0, 2), Coordinates(0, 3)]),
@@ -72,7 +79,7 @@ def testCanvas_whenSnakeMoving_thenOppositeKeyEventDoesNotDoAnything():
         "after snake got opposite KeyEvent."
 
 def testCanvas_whenSnakeHitTheEndOfCanvas_thenAppearsOnOppositeSide():
-    canvas = ConsoleCanvas(5, 5)
+    canvas = NumpyCanvas(MapSize(5, 5))
     spy_canvas = SpyCanvas(canvas)
     snake = Snake(
         deque([Coordinates(0, 3), Coordinates(0, 2), Coordinates(0,1)]),
@@ -93,4 +100,16 @@ def testCanvas_whenSnakeHitTheEndOfCanvas_thenAppearsOnOppositeSide():
            Coordinates(4, 0) in body_on_canvas and \
            Coordinates(4, 4) in body_on_canvas, \
         "The snake should be reappear on the opposite side of the screen " \
-        "when it hits the end of the screen."
\ No newline at end of file
+        "when it hits the end of the screen."
+
+
+def testNumpyCanvas_whenVisualizerRendersSnake_thenBodyIsInTheBuffer():
+    canvas = NumpyCanvas(MapSize(3, 4))
+    snake = Snake(deque([Coordinates(1, 0), Coordinates(1, 1), Coordinates(2, 1)]), KeyEvent.DOWN, MapSize(3, 4))
+    visualizer = Visualizer([snake], canvas)
+    visualizer.render()
+    snake.tick()
+    visualizer.render()
+    assert canvas.to_text() == " x  \n x  \n x  ", \
+        "The buffer should hold only the body of the last frame."
+    assert canvas.to_array().sum() == 3 and canvas.rendered_frames == 2
@@ -0,0 +1,47 @@
+from bosch_ASDIIE.solid_version.core.tick_scheduler import TickScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def testTickScheduler_whenTickIsFast_thenSleepsUntilTheDeadline():
+    clock = FakeClock()
+    scheduler = TickScheduler(0.4, clock=clock, sleep=clock.sleep)
+    scheduler.start()
+    for _ in range(3):
+        clock.now += 0.1
+        assert scheduler.should_render(), \
+            "A tick finishing before its deadline should be rendered."
+        scheduler.wait_next_tick()
+    assert abs(clock.now - 101.2) < 1e-9, \
+        "The ticks should follow the deadlines without drifting."
+    assert scheduler.statistics.overrun_ticks == 0
+
+
+def testTickScheduler_whenTickIsLate_thenRendersAreSkippedButTicksCatchUp():
+    clock = FakeClock()
+    scheduler = TickScheduler(0.4, clock=clock, sleep=clock.sleep)
+    scheduler.start()
+    clock.now += 1.0
+    assert not scheduler.should_render(), \
+        "The render should be skipped when the tick is behind its deadline."
+    scheduler.wait_next_tick()
+    assert clock.slept == [], \
+        "The scheduler should not sleep while it is behind."
+    scheduler.wait_next_tick()
+    scheduler.wait_next_tick()
+    assert abs(clock.slept[-1] - 0.2) < 1e-9, \
+        "After catching up, the next deadline should be on the original schedule."
+    assert scheduler.statistics.overrun_ticks == 2
+    assert abs(scheduler.statistics.max_overrun - 0.6) < 1e-9
+    assert scheduler.statistics.skipped_renders == 1